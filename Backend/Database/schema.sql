@@ -181,4 +181,459 @@ CREATE POLICY "Allow public update on active_game_states" ON active_game_states
     FOR UPDATE USING (true);
 
 CREATE POLICY "Allow public delete on active_game_states" ON active_game_states
-    FOR DELETE USING (true);
\ No newline at end of file
+    FOR DELETE USING (true);
+-- ============================================================================
+-- ATOMIC SCORE UPDATES
+-- ============================================================================
+
+-- Add score_change to one participant in a single statement so concurrent
+-- scorers never overwrite each other. Scores are clamped at zero. Returns no
+-- row when the game has no state yet; when the participant index is out of
+-- range the state comes back unchanged, so callers can tell the two apart.
+CREATE OR REPLACE FUNCTION increment_participant_score(
+    p_scheduled_game_id BIGINT,
+    p_participant_index INTEGER,
+    p_score_change INTEGER
+)
+RETURNS SETOF active_game_states AS $$
+    WITH updated AS (
+        UPDATE active_game_states
+        SET current_scores = jsonb_set(
+                current_scores,
+                ARRAY['participants', p_participant_index::text, 'score'],
+                to_jsonb(GREATEST(
+                    COALESCE((current_scores #>> ARRAY['participants', p_participant_index::text, 'score'])::INTEGER, 0)
+                        + p_score_change,
+                    0
+                ))
+            ),
+            updated_at = TIMEZONE('utc'::text, NOW())
+        WHERE scheduled_game_id = p_scheduled_game_id
+          AND p_participant_index >= 0
+          AND p_participant_index < jsonb_array_length(current_scores->'participants')
+        RETURNING *
+    )
+    SELECT * FROM updated
+    UNION ALL
+    SELECT * FROM active_game_states
+    WHERE scheduled_game_id = p_scheduled_game_id
+      AND NOT EXISTS (SELECT 1 FROM updated);
+$$ LANGUAGE sql;
+
+-- ============================================================================
+-- DASHBOARD STATISTICS
+-- ============================================================================
+
+-- All dashboard counters in one call, so the API never downloads whole
+-- tables just to count them
+CREATE OR REPLACE FUNCTION get_dashboard_stats()
+RETURNS JSON AS $$
+    SELECT json_build_object(
+        'total_games', (SELECT COUNT(*) FROM games),
+        'games_by_category', COALESCE(
+            (SELECT json_object_agg(category, total)
+             FROM (SELECT category, COUNT(*) AS total FROM games GROUP BY category) AS by_category),
+            '{}'::json
+        ),
+        'total_scheduled_games', (SELECT COUNT(*) FROM scheduled_games),
+        'active_games', (SELECT COUNT(*) FROM scheduled_games WHERE is_active = TRUE),
+        'pending_games', (SELECT COUNT(*) FROM scheduled_games WHERE is_active = FALSE),
+        'completed_games', (SELECT COUNT(*) FROM active_game_states WHERE status = 'completed'),
+        'total_teams', (SELECT COUNT(*) FROM team_registrations),
+        'total_team_players', (SELECT COALESCE(SUM(cardinality(players)), 0) FROM team_registrations),
+        'total_individual_players', (SELECT COUNT(*) FROM individual_registrations)
+    );
+$$ LANGUAGE sql STABLE;
+
+-- ============================================================================
+-- MATERIALIZED RESULTS
+-- ============================================================================
+
+-- Ranked standings written once by declare_winner. summary is what the
+-- results lists return, details is the full ranking for /results/{id}.
+-- Run Backend/backfill_results.py to fill it for games completed earlier.
+CREATE TABLE IF NOT EXISTS game_results (
+    id BIGSERIAL PRIMARY KEY,
+    scheduled_game_id BIGINT NOT NULL REFERENCES scheduled_games(id) ON DELETE CASCADE,
+    summary JSONB NOT NULL,
+    details JSONB NOT NULL,
+    completed_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL,
+    UNIQUE(scheduled_game_id)
+);
+
+ALTER TABLE game_results ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Allow public read access on game_results" ON game_results;
+DROP POLICY IF EXISTS "Allow public insert on game_results" ON game_results;
+DROP POLICY IF EXISTS "Allow public update on game_results" ON game_results;
+
+CREATE POLICY "Allow public read access on game_results" ON game_results
+    FOR SELECT USING (true);
+
+CREATE POLICY "Allow public insert on game_results" ON game_results
+    FOR INSERT WITH CHECK (true);
+
+CREATE POLICY "Allow public update on game_results" ON game_results
+    FOR UPDATE USING (true);
+
+-- Denormalized game category so category result pages filter in the index
+ALTER TABLE game_results ADD COLUMN IF NOT EXISTS category TEXT;
+
+UPDATE game_results SET category = summary->'game'->>'category' WHERE category IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_game_results_category_completed_at ON game_results(category, completed_at DESC);
+
+-- ============================================================================
+-- KEYSET PAGINATION
+-- ============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_scheduled_games_date_time_id ON scheduled_games(date, scheduled_time, id);
+CREATE INDEX IF NOT EXISTS idx_team_registrations_game_registered_at ON team_registrations(scheduled_game_id, registered_at, id);
+CREATE INDEX IF NOT EXISTS idx_individual_registrations_game_registered_at ON individual_registrations(scheduled_game_id, registered_at, id);
+CREATE INDEX IF NOT EXISTS idx_game_results_completed_at_id ON game_results(completed_at DESC, id DESC);
+
+-- Superseded by idx_game_results_completed_at_id, which has completed_at as its leading column
+DROP INDEX IF EXISTS idx_game_results_completed_at;
+
+-- ============================================================================
+-- ADMIN SESSIONS
+-- ============================================================================
+
+-- Shared admin sessions for SESSION_STORE=supabase. Only a SHA-256 hash of
+-- each token is stored.
+CREATE TABLE IF NOT EXISTS admin_sessions (
+    token_hash TEXT PRIMARY KEY,
+    username TEXT NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_admin_sessions_expires_at ON admin_sessions(expires_at);
+
+-- No policies on purpose: the anon key cannot read or write sessions. The
+-- API reaches this table with SUPABASE_SERVICE_KEY (service_role bypasses RLS).
+ALTER TABLE admin_sessions ENABLE ROW LEVEL SECURITY;
+
+-- Logged-out signed admin tokens (ADMIN_TOKEN_MODE=signed), kept until they
+-- would have expired anyway
+CREATE TABLE IF NOT EXISTS revoked_admin_tokens (
+    token_id TEXT PRIMARY KEY,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_revoked_admin_tokens_expires_at ON revoked_admin_tokens(expires_at);
+
+-- Same as admin_sessions: only the API's SUPABASE_SERVICE_KEY client gets in
+ALTER TABLE revoked_admin_tokens ENABLE ROW LEVEL SECURITY;
+
+-- ============================================================================
+-- LIVE SCOREBOARD VERSIONS
+-- ============================================================================
+
+-- Every change to a scheduled game or a game state takes the next value of
+-- one shared sequence, so /live-games?since=<version> can send only the
+-- games that changed.
+CREATE SEQUENCE IF NOT EXISTS live_version_seq;
+
+ALTER TABLE scheduled_games ADD COLUMN IF NOT EXISTS version BIGINT NOT NULL DEFAULT nextval('live_version_seq');
+ALTER TABLE active_game_states ADD COLUMN IF NOT EXISTS version BIGINT NOT NULL DEFAULT nextval('live_version_seq');
+
+CREATE OR REPLACE FUNCTION bump_live_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.version := nextval('live_version_seq');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS scheduled_games_bump_version ON scheduled_games;
+CREATE TRIGGER scheduled_games_bump_version
+    BEFORE UPDATE ON scheduled_games
+    FOR EACH ROW EXECUTE FUNCTION bump_live_version();
+
+DROP TRIGGER IF EXISTS active_game_states_bump_version ON active_game_states;
+CREATE TRIGGER active_game_states_bump_version
+    BEFORE UPDATE ON active_game_states
+    FOR EACH ROW EXECUTE FUNCTION bump_live_version();
+
+-- ============================================================================
+-- TEAM REGISTRATION ADMISSION
+-- ============================================================================
+
+-- Admits a team in one statement. The scheduled game row is locked, so two
+-- captains racing for the last slot are checked one after the other, and the
+-- UNIQUE(scheduled_game_id, team_name) constraint settles duplicate names.
+-- Returns {"registration": row} or {"error": code[, "limit": n]}.
+CREATE OR REPLACE FUNCTION register_team(
+    p_scheduled_game_id BIGINT,
+    p_team_name TEXT,
+    p_captain_name TEXT,
+    p_captain_phone TEXT,
+    p_captain_email TEXT,
+    p_players TEXT[]
+)
+RETURNS JSON AS $$
+DECLARE
+    v_game scheduled_games%ROWTYPE;
+    v_registration team_registrations%ROWTYPE;
+BEGIN
+    SELECT * INTO v_game FROM scheduled_games WHERE id = p_scheduled_game_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RETURN json_build_object('error', 'not_found');
+    END IF;
+    IF NOT COALESCE(v_game.registration_open, TRUE) THEN
+        RETURN json_build_object('error', 'closed');
+    END IF;
+    IF v_game.game_type <> 'team' THEN
+        RETURN json_build_object('error', 'wrong_type');
+    END IF;
+    IF v_game.max_teams IS NOT NULL AND v_game.max_teams > 0 AND (
+        SELECT COUNT(*) FROM team_registrations WHERE scheduled_game_id = p_scheduled_game_id
+    ) >= v_game.max_teams THEN
+        RETURN json_build_object('error', 'full');
+    END IF;
+    IF v_game.max_players_per_team IS NOT NULL AND v_game.max_players_per_team > 0
+        AND cardinality(p_players) > v_game.max_players_per_team THEN
+        RETURN json_build_object('error', 'too_many_players', 'limit', v_game.max_players_per_team);
+    END IF;
+
+    INSERT INTO team_registrations (
+        scheduled_game_id, team_name, captain_name, captain_phone, captain_email, players
+    )
+    VALUES (
+        p_scheduled_game_id, p_team_name, p_captain_name, p_captain_phone, p_captain_email, p_players
+    )
+    ON CONFLICT (scheduled_game_id, team_name) DO NOTHING
+    RETURNING * INTO v_registration;
+    IF NOT FOUND THEN
+        RETURN json_build_object('error', 'duplicate');
+    END IF;
+
+    RETURN json_build_object('registration', row_to_json(v_registration));
+END;
+$$ LANGUAGE plpgsql;
+
+-- Bulk import: p_teams is a JSON array of team registrations. Every game they
+-- name is locked up front, in id order so two imports cannot deadlock, and
+-- each team then goes through register_team, so imports and single sign-ups
+-- share one capacity check. Returns one register_team result per team, in
+-- the order given.
+CREATE OR REPLACE FUNCTION register_teams(p_teams JSONB)
+RETURNS JSON AS $$
+DECLARE
+    v_team JSONB;
+    v_results JSON[] := '{}';
+BEGIN
+    PERFORM 1 FROM scheduled_games
+    WHERE id IN (SELECT (team->>'scheduled_game_id')::BIGINT FROM jsonb_array_elements(p_teams) AS team)
+    ORDER BY id
+    FOR UPDATE;
+
+    FOR v_team IN SELECT * FROM jsonb_array_elements(p_teams) LOOP
+        v_results := v_results || register_team(
+            (v_team->>'scheduled_game_id')::BIGINT,
+            v_team->>'team_name',
+            v_team->>'captain_name',
+            v_team->>'captain_phone',
+            v_team->>'captain_email',
+            ARRAY(SELECT jsonb_array_elements_text(COALESCE(v_team->'players', '[]'::JSONB)))
+        );
+    END LOOP;
+
+    RETURN array_to_json(v_results);
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================================
+-- LEAGUE SCHEDULING
+-- ============================================================================
+
+-- League columns written by the league endpoints
+ALTER TABLE scheduled_games
+ADD COLUMN IF NOT EXISTS is_league BOOLEAN DEFAULT FALSE,
+ADD COLUMN IF NOT EXISTS league_stage TEXT,
+ADD COLUMN IF NOT EXISTS team1_id BIGINT,
+ADD COLUMN IF NOT EXISTS team2_id BIGINT,
+ADD COLUMN IF NOT EXISTS parent_game_id BIGINT;
+
+-- parent_game_id points back at the match a /next-stage match follows.
+-- Generated knockout matches instead point forward: next_match_id is the
+-- match their winner moves on to and bracket_slot says whether the winner
+-- becomes its team1 (1) or team2 (2).
+ALTER TABLE scheduled_games ADD COLUMN IF NOT EXISTS bracket_slot SMALLINT CHECK (bracket_slot IN (1, 2));
+ALTER TABLE scheduled_games ADD COLUMN IF NOT EXISTS next_match_id BIGINT REFERENCES scheduled_games(id) ON DELETE SET NULL;
+
+-- Brackets generated before next_match_id stored the forward link in parent_game_id
+UPDATE scheduled_games
+SET next_match_id = parent_game_id, parent_game_id = NULL
+WHERE bracket_slot IS NOT NULL AND next_match_id IS NULL AND parent_game_id IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_scheduled_games_next_match_id ON scheduled_games(next_match_id);
+
+-- Inserts a whole generated bracket in one transaction. p_matches is a JSON
+-- array of match rows in insert order; a row may carry a "key" and the
+-- "next_key" of an earlier row, which becomes its next_match_id. A game
+-- gets one bracket: with league matches already present nothing is inserted.
+-- Returns {"matches": [rows in insert order]} or {"error": "bracket_exists"}.
+CREATE OR REPLACE FUNCTION create_league_bracket(p_game_id BIGINT, p_matches JSONB)
+RETURNS JSON AS $$
+DECLARE
+    v_match JSONB;
+    v_ids JSONB := '{}'::jsonb;
+    v_created JSONB := '[]'::jsonb;
+    v_row scheduled_games%ROWTYPE;
+BEGIN
+    -- Two requests for the same game take turns, so only one bracket is built
+    PERFORM pg_advisory_xact_lock(p_game_id);
+    IF EXISTS (SELECT 1 FROM scheduled_games WHERE game_id = p_game_id AND is_league = TRUE) THEN
+        RETURN json_build_object('error', 'bracket_exists');
+    END IF;
+
+    FOR v_match IN SELECT value FROM jsonb_array_elements(p_matches) LOOP
+        INSERT INTO scheduled_games (
+            game_id, scheduled_time, date, venue, participants, game_type, is_active,
+            registration_open, max_teams, max_players_per_team, is_league, league_stage,
+            team1_id, team2_id, next_match_id, bracket_slot
+        )
+        VALUES (
+            p_game_id,
+            v_match->>'scheduled_time',
+            v_match->>'date',
+            v_match->>'venue',
+            ARRAY(SELECT jsonb_array_elements_text(v_match->'participants')),
+            'team',
+            FALSE,
+            FALSE,
+            2,
+            (v_match->>'max_players_per_team')::INTEGER,
+            TRUE,
+            v_match->>'league_stage',
+            (v_match->>'team1_id')::BIGINT,
+            (v_match->>'team2_id')::BIGINT,
+            (v_ids->>(v_match->>'next_key'))::BIGINT,
+            (v_match->>'bracket_slot')::SMALLINT
+        )
+        RETURNING * INTO v_row;
+
+        IF v_match ? 'key' THEN
+            v_ids := v_ids || jsonb_build_object(v_match->>'key', v_row.id);
+        END IF;
+        v_created := v_created || jsonb_build_array(to_jsonb(v_row));
+    END LOOP;
+
+    RETURN json_build_object('matches', v_created);
+END;
+$$ LANGUAGE plpgsql;
+
+-- Every team registered for any non-league instance of a base game, one row
+-- per team name. When a name appears in several instances the registration
+-- from the latest instance is kept.
+CREATE OR REPLACE FUNCTION get_teams_for_game(p_game_id BIGINT)
+RETURNS SETOF team_registrations AS $$
+    SELECT DISTINCT ON (tr.team_name) tr.*
+    FROM team_registrations tr
+    JOIN scheduled_games sg ON sg.id = tr.scheduled_game_id
+    WHERE sg.game_id = p_game_id
+      AND sg.is_league = FALSE
+    ORDER BY tr.team_name, tr.scheduled_game_id DESC, tr.id DESC;
+$$ LANGUAGE sql STABLE;
+
+CREATE INDEX IF NOT EXISTS idx_scheduled_games_parent_game_id ON scheduled_games(parent_game_id);
+
+-- Called by declare_winner. Deactivates the game and, for a league match,
+-- moves the winner's team into the next match in the same transaction: the
+-- next_match_id match of a generated bracket, in its bracket_slot, or else
+-- the match created with /next-stage for this one, in its first empty slot.
+-- Returns the updated next match, or null when nothing moved forward.
+CREATE OR REPLACE FUNCTION complete_scheduled_game(p_scheduled_game_id BIGINT, p_winner_name TEXT)
+RETURNS JSON AS $$
+DECLARE
+    v_game scheduled_games%ROWTYPE;
+    v_next scheduled_games%ROWTYPE;
+    v_winner_id BIGINT;
+    v_slot INTEGER;
+BEGIN
+    UPDATE scheduled_games SET is_active = FALSE WHERE id = p_scheduled_game_id
+    RETURNING * INTO v_game;
+    IF NOT FOUND OR NOT COALESCE(v_game.is_league, FALSE) THEN
+        RETURN NULL;
+    END IF;
+
+    SELECT id INTO v_winner_id FROM team_registrations
+    WHERE id IN (v_game.team1_id, v_game.team2_id) AND team_name = p_winner_name;
+    IF v_winner_id IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    IF v_game.next_match_id IS NOT NULL THEN
+        SELECT * INTO v_next FROM scheduled_games WHERE id = v_game.next_match_id FOR UPDATE;
+        v_slot := v_game.bracket_slot;
+    ELSE
+        SELECT * INTO v_next FROM scheduled_games
+        WHERE parent_game_id = p_scheduled_game_id AND is_league = TRUE
+        ORDER BY id
+        LIMIT 1
+        FOR UPDATE;
+        v_slot := CASE WHEN v_next.team1_id IS NULL THEN 1 WHEN v_next.team2_id IS NULL THEN 2 END;
+    END IF;
+    IF v_next.id IS NULL OR v_slot IS NULL OR v_winner_id IN (v_next.team1_id, v_next.team2_id) THEN
+        RETURN NULL;
+    END IF;
+
+    UPDATE scheduled_games
+    SET team1_id = CASE WHEN v_slot = 1 THEN v_winner_id ELSE team1_id END,
+        team2_id = CASE WHEN v_slot = 2 THEN v_winner_id ELSE team2_id END,
+        participants = CASE
+            WHEN v_slot = 1 THEN ARRAY[p_winner_name, COALESCE(participants[2], '')]
+            ELSE ARRAY[COALESCE(participants[1], ''), p_winner_name]
+        END
+    WHERE id = v_next.id
+    RETURNING * INTO v_next;
+
+    RETURN row_to_json(v_next);
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================================
+-- REGISTRATION SURGE
+-- ============================================================================
+
+-- Set when registration is opened. With REGISTRATION_SURGE_MODE=auto every
+-- API process polls the latest value to know it is inside the surge window.
+ALTER TABLE scheduled_games ADD COLUMN IF NOT EXISTS registration_opened_at TIMESTAMP WITH TIME ZONE;
+
+CREATE INDEX IF NOT EXISTS idx_scheduled_games_registration_opened_at ON scheduled_games(registration_opened_at);
+
+-- Outcome of every queued registration. The process that queued it writes
+-- the result here, so GET /registration-tickets/{id} works on any process.
+CREATE TABLE IF NOT EXISTS registration_tickets (
+    ticket_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL CHECK (kind IN ('team', 'individual')),
+    status TEXT NOT NULL DEFAULT 'queued' CHECK (status IN ('queued', 'registered', 'rejected', 'failed')),
+    registration JSONB,
+    error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_registration_tickets_updated_at ON registration_tickets(updated_at);
+
+ALTER TABLE registration_tickets ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Allow public read access on registration_tickets" ON registration_tickets;
+DROP POLICY IF EXISTS "Allow public insert on registration_tickets" ON registration_tickets;
+DROP POLICY IF EXISTS "Allow public update on registration_tickets" ON registration_tickets;
+DROP POLICY IF EXISTS "Allow public delete on registration_tickets" ON registration_tickets;
+
+CREATE POLICY "Allow public read access on registration_tickets" ON registration_tickets
+    FOR SELECT USING (true);
+
+CREATE POLICY "Allow public insert on registration_tickets" ON registration_tickets
+    FOR INSERT WITH CHECK (true);
+
+CREATE POLICY "Allow public update on registration_tickets" ON registration_tickets
+    FOR UPDATE USING (true);
+
+CREATE POLICY "Allow public delete on registration_tickets" ON registration_tickets
+    FOR DELETE USING (true);
@@ -0,0 +1,38 @@
+"""Fill game_results for games that were completed before it existed.
+
+Usage: python backfill_results.py
+"""
+import asyncio
+
+from main import supabase, run_query, build_result_row
+
+# Below PostgREST's default max-rows (1000), so every page comes back whole
+BATCH_SIZE = 500
+
+
+async def backfill_results():
+    total = 0
+    last_id = 0
+    while True:
+        # Keyset pages by id, so no completed state is skipped or read twice
+        states_response = await run_query(supabase.table("active_game_states").select(
+            "*, scheduled_games(*, games(*))"
+        ).eq("status", "completed").gt("id", last_id).order("id").limit(BATCH_SIZE))
+        
+        if not states_response.data:
+            break
+        
+        rows = [build_result_row(state) for state in states_response.data]
+        await run_query(supabase.table("game_results").upsert(rows, on_conflict="scheduled_game_id"))
+        total += len(rows)
+        last_id = states_response.data[-1]["id"]
+        print(f"Materialized {total} completed games so far")
+    
+    if not total:
+        print("No completed games to backfill")
+        return
+    print(f"Materialized results for {total} completed games")
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill_results())
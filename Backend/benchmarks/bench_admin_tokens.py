@@ -0,0 +1,67 @@
+"""Cost of verify_admin_token per request for each token mode.
+
+  session, memory     token looked up in this worker's MemorySessionStore
+  session, supabase   token hash looked up in admin_sessions, one round trip
+                      of --latency-ms on the stand-in client
+  signed              HMAC-SHA256 checked with hmac.compare_digest, no lookup
+
+    python Backend/benchmarks/bench_admin_tokens.py --latency-ms 20
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from festival import FestivalClient, import_main
+
+
+async def per_call_us(verify, token, calls):
+    authorization = f"Bearer {token}"
+    started = time.perf_counter()
+    for _ in range(calls):
+        await verify(authorization)
+    return (time.perf_counter() - started) / calls * 1_000_000
+
+
+async def compare(api, args):
+    now = datetime.now(timezone.utc)
+    session = {"username": api.ADMIN_USERNAME, "created_at": now, "expires_at": now + api.SESSION_TTL}
+    session_token = "benchmark-session-token"
+
+    memory_store = api.MemorySessionStore()
+    await memory_store.put(session_token, session)
+    supabase_store = api.SupabaseSessionStore(FestivalClient({"admin_sessions": [{
+        "token_hash": api.SupabaseSessionStore.token_hash(session_token),
+        "username": session["username"],
+        "created_at": session["created_at"].isoformat(),
+        "expires_at": session["expires_at"].isoformat()
+    }]}, latency=args.latency_ms / 1000))
+    signed_token = api.issue_signed_token(api.ADMIN_USERNAME, session["expires_at"])
+
+    results = []
+    for label, mode, store, token, calls in (
+        ("session, memory", "session", memory_store, session_token, args.calls),
+        ("session, supabase", "session", supabase_store, session_token, args.round_trips),
+        ("signed", "signed", memory_store, signed_token, args.calls),
+    ):
+        api.ADMIN_TOKEN_MODE = mode
+        api.session_store = store
+        results.append((label, await per_call_us(api.verify_admin_token, token, calls)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=100_000)
+    parser.add_argument("--round-trips", type=int, default=50, help="calls for the supabase store")
+    parser.add_argument("--latency-ms", type=float, default=20, help="admin_sessions round trip")
+    args = parser.parse_args()
+
+    api = import_main(ADMIN_TOKEN_SECRET="benchmark-secret")
+    print(f"{'mode':<18} {'us per request':>15}")
+    for label, cost in asyncio.run(compare(api, args)):
+        print(f"{label:<18} {cost:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""/results/category/{category}: filtering in Python vs in the database.
+
+Seeds --games completed games spread over the five categories into
+game_results (rows built by main.build_result_row), then times the two
+queries the route has used, including fetching and decoding the rows:
+
+  python filter  read every result, keep the category in Python (before)
+  database       WHERE category = ... on idx_game_results_category_completed_at
+
+Needs a throwaway Postgres with Database/schema.sql applied, e.g. the one
+the tests use. The seeded games are deleted afterwards.
+
+    TEST_DATABASE_URL=postgresql://... python Backend/benchmarks/bench_category_results.py
+"""
+import argparse
+import json
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+import psycopg
+from psycopg.rows import dict_row
+
+from festival import CATEGORIES, import_main
+
+FESTIVAL_START = datetime(2026, 1, 14, tzinfo=timezone.utc)
+ALL_RESULTS = "SELECT summary FROM game_results ORDER BY completed_at DESC"
+CATEGORY_RESULTS = "SELECT summary FROM game_results WHERE category = %s ORDER BY completed_at DESC"
+
+
+def completed_state(scheduled_game, game, index):
+    teams = [{"name": f"Team {k}", "score": random.randint(0, 30)} for k in range(8)]
+    return {
+        "id": index,
+        "scheduled_game_id": scheduled_game,
+        "current_scores": {"participants": teams},
+        "winner_data": {"winner_name": teams[0]["name"], "winner_score": teams[0]["score"]},
+        "updated_at": (FESTIVAL_START + timedelta(minutes=index)).isoformat(),
+        "scheduled_games": {
+            "date": "2026-01-15",
+            "venue": "Temple ground",
+            "game_type": "team",
+            "games": game
+        }
+    }
+
+
+def seed(conn, api, count):
+    """Insert count completed games, returning the ids of the catalogue games to delete"""
+    games = []
+    for category in CATEGORIES:
+        game = conn.cursor(row_factory=dict_row).execute(
+            "INSERT INTO games (icon, tamil, english, category) VALUES (%s, %s, %s, %s) RETURNING *",
+            ("🏁", "விளையாட்டு", f"Benchmark {category}", category),
+        ).fetchone()
+        games.append({**game, "created_at": game["created_at"].isoformat()})
+
+    with conn.cursor() as cursor:
+        for index in range(count):
+            game = games[index % len(games)]
+            scheduled_game = cursor.execute(
+                "INSERT INTO scheduled_games (game_id, scheduled_time, date, venue, participants) "
+                "VALUES (%s, '10:00', '2026-01-15', 'Temple ground', '{}') RETURNING id",
+                (game["id"],),
+            ).fetchone()[0]
+            row = api.build_result_row(completed_state(scheduled_game, game, index))
+            cursor.execute(
+                "INSERT INTO game_results (scheduled_game_id, category, summary, details, completed_at) "
+                "VALUES (%s, %s, %s, %s, %s)",
+                (row["scheduled_game_id"], row["category"], json.dumps(row["summary"]),
+                 json.dumps(row["details"]), row["completed_at"]),
+            )
+    conn.execute("ANALYZE game_results")
+    return [game["id"] for game in games]
+
+
+def python_filter(conn, category):
+    rows = conn.execute(ALL_RESULTS).fetchall()
+    return [summary for (summary,) in rows if summary["game"]["category"] == category]
+
+
+def database_filter(conn, category):
+    return [summary for (summary,) in conn.execute(CATEGORY_RESULTS, (category,)).fetchall()]
+
+
+def best_ms(run, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=os.getenv("TEST_DATABASE_URL"))
+    parser.add_argument("--games", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("set TEST_DATABASE_URL or pass --database-url")
+
+    random.seed(0)
+    api = import_main()
+    with psycopg.connect(args.database_url, autocommit=True) as conn:
+        game_ids = seed(conn, api, args.games)
+        try:
+            total = conn.execute("SELECT COUNT(*) FROM game_results").fetchone()[0]
+            plan = [line for (line,) in conn.execute("EXPLAIN " + CATEGORY_RESULTS, ("kids",))]
+            print(f"{total} results; database query plan:")
+            print("\n".join(f"  {line}" for line in plan))
+            print(f"{'category':<8} {'rows':>6} {'python filter ms':>17} {'database ms':>12}")
+            for category in CATEGORIES:
+                rows = database_filter(conn, category)
+                assert rows == python_filter(conn, category)
+                before = best_ms(lambda: python_filter(conn, category), args.repeat)
+                after = best_ms(lambda: database_filter(conn, category), args.repeat)
+                print(f"{category:<8} {len(rows):>6} {before:>17.1f} {after:>12.1f}")
+        finally:
+            conn.execute("DELETE FROM games WHERE id = ANY(%s)", (game_ids,))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Response sizes with and without compression on a 200-game festival day.
+
+Each route is fetched three ways: uncompressed, with Accept-Encoding: gzip,
+and with the "br, gzip" a browser sends. Brotli is only used for the cached
+payloads (/games, /live-games) and only when the brotli package is
+installed; everything else falls back to the gzip middleware. Bodies
+under COMPRESSION_MIN_SIZE, like /health, are sent as they are.
+
+    python Backend/benchmarks/bench_compression.py --scheduled-games 200
+"""
+import argparse
+import asyncio
+
+import httpx
+
+from festival import FestivalClient, festival_dataset, import_main
+
+PATHS = ["/scheduled-games?limit=200", "/live-games", "/games", "/health"]
+ENCODINGS = ["identity", "gzip", "br, gzip"]
+
+
+async def measure(api):
+    sizes = []
+    transport = httpx.ASGITransport(app=api.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for path in PATHS:
+            row = []
+            for encoding in ENCODINGS:
+                # response.content would be decoded, so count the raw bytes
+                async with client.stream("GET", path, headers={"Accept-Encoding": encoding}) as response:
+                    response.raise_for_status()
+                    size = sum([len(chunk) async for chunk in response.aiter_raw()])
+                row.append((size, response.headers.get("content-encoding", "-")))
+            sizes.append((path, row))
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scheduled-games", type=int, default=200)
+    parser.add_argument("--live-games", type=int, default=20)
+    args = parser.parse_args()
+
+    api = import_main()
+    api.supabase = FestivalClient(festival_dataset(args.scheduled_games, live_games=args.live_games))
+
+    print(f"{args.scheduled_games} scheduled games, {args.live_games} live, minimum size {api.COMPRESSION_MIN_SIZE}")
+    print(f"{'route':<28} {'plain':>8} {'gzip':>8} {'br, gzip':>14}")
+    for path, row in asyncio.run(measure(api)):
+        (plain, _), (gzipped, _), (browser, encoding) = row
+        print(f"{path:<28} {plain:>8} {gzipped:>8} {browser:>8} {encoding:>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Time to serve --rows team registration rows for each response path.
+
+  response_model   List[TeamRegistration] validation, then jsonable_encoder
+                   and json.dumps (get_team_registrations before the fast path)
+  jsonable_encoder plain list return, jsonable_encoder and json.dumps
+  fast, json       FastJSONResponse with the stdlib json fallback
+  fast, orjson     FastJSONResponse with orjson, when it is installed
+  empty            FastJSONResponse([]), the per-request cost of the app itself
+
+Each path is a route on a small app served in-process, timed per request.
+
+    python Backend/benchmarks/bench_json_responses.py --rows 1000
+"""
+import argparse
+import asyncio
+import time
+from typing import List
+
+import httpx
+from fastapi import FastAPI
+
+from festival import import_main
+
+
+def registration_rows(count):
+    return [
+        {
+            "id": index,
+            "scheduled_game_id": index // 16,
+            "team_name": f"Team {index}",
+            "captain_name": f"Captain {index}",
+            "captain_phone": "+91 98400 00000",
+            "captain_email": None,
+            "players": [f"Player {index}.{k}" for k in range(6)],
+            "registered_at": "2026-01-10T08:30:00.123456+00:00"
+        }
+        for index in range(count)
+    ]
+
+
+def benchmark_app(api, rows):
+    app = FastAPI()
+
+    @app.get("/response-model", response_model=List[api.TeamRegistration])
+    async def response_model():
+        return rows
+
+    @app.get("/encoder")
+    async def encoder():
+        return rows
+
+    @app.get("/fast")
+    async def fast():
+        return api.FastJSONResponse(rows)
+
+    @app.get("/empty")
+    async def empty():
+        return api.FastJSONResponse([])
+
+    return app
+
+
+async def per_request_ms(client, path, requests):
+    (await client.get(path)).raise_for_status()
+    started = time.perf_counter()
+    for _ in range(requests):
+        await client.get(path)
+    return (time.perf_counter() - started) / requests * 1000
+
+
+async def compare(api, app, paths, requests):
+    orjson = api.orjson
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for label, path, encoder in paths:
+            api.orjson = encoder
+            results.append((label, await per_request_ms(client, path, requests)))
+    api.orjson = orjson
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    api = import_main()
+    orjson = api.orjson
+    app = benchmark_app(api, registration_rows(args.rows))
+
+    paths = [
+        ("response_model", "/response-model", orjson),
+        ("jsonable_encoder", "/encoder", orjson),
+        ("fast, json", "/fast", None),
+    ]
+    if orjson is not None:
+        paths.append(("fast, orjson", "/fast", orjson))
+    paths.append(("empty", "/empty", orjson))
+
+    print(f"{args.rows} rows, {'orjson installed' if orjson else 'orjson not installed'}")
+    print(f"{'path':<17} {'ms per request':>15}")
+    for label, cost in asyncio.run(compare(api, app, paths, args.requests)):
+        print(f"{label:<17} {cost:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
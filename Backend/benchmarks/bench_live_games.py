@@ -0,0 +1,99 @@
+"""p50/p99 latency of concurrent /live-games polling, before and after run_query.
+
+--clients scoreboard screens poll /live-games while --browsers visitors page
+through /scheduled-games, which is not cached. Every query takes
+--latency-ms on the stand-in client and the scoreboard reloads every --ttl
+seconds. "blocking" calls query.execute() on the event loop, as the routes
+did before run_query; "thread pool" is run_query as it is now.
+
+    python Backend/benchmarks/bench_live_games.py --clients 200 --seconds 10
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import httpx
+
+from festival import FestivalClient, festival_dataset, import_main
+
+LIVE_PATH = "/live-games"
+SCHEDULE_PATH = "/scheduled-games?limit=50"
+
+
+async def poll(client, path, deadline, interval, latencies):
+    # Latency is counted from when each poll was due, not from when it was
+    # sent, so a poll held up by a frozen event loop is charged for the wait.
+    # Clients start at random points of the interval, like real viewers.
+    due = time.perf_counter() + random.uniform(0, interval)
+    while due < deadline:
+        await asyncio.sleep(max(due - time.perf_counter(), 0))
+        response = await client.get(path)
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - due)
+        due += interval
+
+
+async def measure(api, args):
+    api.invalidate_scoreboard()
+    latencies = {LIVE_PATH: [], SCHEDULE_PATH: []}
+    transport = httpx.ASGITransport(app=api.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        deadline = time.perf_counter() + args.seconds
+        paths = [LIVE_PATH] * args.clients + [SCHEDULE_PATH] * args.browsers
+        await asyncio.gather(*(
+            poll(client, path, deadline, args.interval, latencies[path]) for path in paths
+        ))
+    return latencies
+
+
+async def run_blocking(query):
+    return query.execute()
+
+
+async def compare(api, args):
+    """Measure both modes in one event loop
+
+    main's asyncio locks bind to the first loop that waits on them.
+    """
+    run_query = api.run_query
+    results = {}
+    for label, runner in (("blocking", run_blocking), ("thread pool", run_query)):
+        api.run_query = runner
+        results[label] = await measure(api, args)
+    api.run_query = run_query
+    return results
+
+
+def report(label, path, latencies):
+    cuts = statistics.quantiles(latencies, n=100)
+    print(f"{label:<12} {path:<26} {len(latencies):>8} {cuts[49] * 1000:>8.1f} {cuts[98] * 1000:>8.1f}")
+
+
+def main():
+    random.seed(0)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=100, help="/live-games pollers")
+    parser.add_argument("--browsers", type=int, default=10, help="/scheduled-games readers")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between one client's requests")
+    parser.add_argument("--latency-ms", type=float, default=40, help="round trip of every query")
+    parser.add_argument("--ttl", type=float, default=0.5, help="SCOREBOARD_TTL_SECONDS")
+    args = parser.parse_args()
+
+    api = import_main(SCOREBOARD_TTL_SECONDS=str(args.ttl))
+    api.supabase = FestivalClient(festival_dataset(), latency=args.latency_ms / 1000)
+
+    print(
+        f"{args.clients} pollers, {args.browsers} browsers, {args.latency_ms:g} ms per query, "
+        f"scoreboard TTL {args.ttl:g} s"
+    )
+    print(f"{'mode':<12} {'route':<26} {'requests':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for label, latencies in asyncio.run(compare(api, args)).items():
+        for path, samples in latencies.items():
+            report(label, path, samples)
+
+
+if __name__ == "__main__":
+    main()
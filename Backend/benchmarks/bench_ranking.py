@@ -0,0 +1,56 @@
+"""Top-K of a large individual event: full sort vs ranking.ranked().
+
+  string sort   sort every runner on float(time) and keep K, as
+                get_all_results and the dashboard did before ranking.py
+  integer sort  the same full sort on main.time_ms
+  ranked        ranked(runners, key=main.time_ms, limit=K)
+
+    python Backend/benchmarks/bench_ranking.py --runners 10000 --top 3
+"""
+import argparse
+import random
+import timeit
+
+from festival import import_main
+
+
+def runners(count):
+    field = []
+    for index in range(count):
+        ms = random.randint(7_200_000, 14_400_000)
+        field.append({"name": f"Runner {index}", "time": f"{ms / 1000:.1f}", "time_ms": ms})
+    return field
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runners", type=int, default=10_000)
+    parser.add_argument("--top", type=int, default=3)
+    parser.add_argument("--number", type=int, default=50, help="calls per timing")
+    parser.add_argument("--repeat", type=int, default=7, help="timings, best one is reported")
+    args = parser.parse_args()
+
+    random.seed(1)
+    api = import_main()
+    from ranking import ranked
+
+    field = runners(args.runners)
+    top = args.top
+    cases = [
+        ("string sort", lambda: sorted(
+            [p for p in field if p.get("time")],
+            key=lambda x: float(str(x.get("time", "999")).replace("s", ""))
+        )[:top]),
+        ("integer sort", lambda: sorted(field, key=api.time_ms)[:top]),
+        ("ranked", lambda: ranked(field, key=api.time_ms, limit=top)),
+    ]
+
+    print(f"{args.runners} runners, top {top}, best of {args.repeat} x {args.number} calls")
+    print(f"{'method':<13} {'ms per call':>12}")
+    for label, case in cases:
+        best = min(timeit.repeat(case, number=args.number, repeat=args.repeat)) / args.number
+        print(f"{label:<13} {best * 1000:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Synthetic festival data and a read-only stand-in for the supabase client.
+
+The benchmarks that drive the API import main with this client in place of
+the real one, so they run without a Supabase project and every query takes
+a fixed, known round trip.
+"""
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CATEGORIES = ["main", "kids", "women", "men", "fun"]
+
+
+def import_main(**env):
+    """Import Backend/main.py with env set first, since it reads config at import"""
+    os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+    os.environ.setdefault("SUPABASE_KEY", "benchmark")
+    os.environ.update(env)
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    import main
+    return main
+
+
+def festival_dataset(scheduled_games=200, games=40, live_games=20, teams_per_game=4):
+    """Tables for a festival day with scheduled_games games, live_games of them live"""
+    catalogue = [
+        {
+            "id": game_id,
+            "icon": "🏏",
+            "tamil": "விளையாட்டு",
+            "english": f"Game {game_id}",
+            "category": CATEGORIES[game_id % len(CATEGORIES)],
+            "created_at": "2026-01-01T00:00:00+00:00"
+        }
+        for game_id in range(1, games + 1)
+    ]
+    tables = {
+        "games": catalogue,
+        "scheduled_games": [],
+        "active_game_states": [],
+        "team_registrations": [],
+        "individual_registrations": []
+    }
+
+    for scheduled_id in range(1, scheduled_games + 1):
+        game = catalogue[scheduled_id % games]
+        tables["scheduled_games"].append({
+            "id": scheduled_id,
+            "game_id": game["id"],
+            "scheduled_time": f"{scheduled_id % 12 + 1}:00 AM",
+            "date": "2026-01-15",
+            "venue": "Temple ground",
+            "participants": [],
+            "game_type": "team",
+            "is_active": scheduled_id <= live_games,
+            "registration_open": True,
+            "max_teams": teams_per_game,
+            "max_players_per_team": 6,
+            "is_league": False,
+            "version": scheduled_id,
+            "created_at": "2026-01-01T00:00:00+00:00",
+            "games": game
+        })
+
+        if scheduled_id > live_games:
+            continue
+        teams = [
+            {
+                "id": scheduled_id * 100 + k,
+                "scheduled_game_id": scheduled_id,
+                "team_name": f"Team {k}",
+                "captain_name": f"Captain {k}",
+                "captain_phone": None,
+                "captain_email": None,
+                "players": [f"Player {k}.{j}" for j in range(6)],
+                "registered_at": "2026-01-10T00:00:00+00:00"
+            }
+            for k in range(teams_per_game)
+        ]
+        tables["team_registrations"].extend(teams)
+        tables["active_game_states"].append({
+            "id": 1000 + scheduled_id,
+            "scheduled_game_id": scheduled_id,
+            "current_scores": {"participants": [
+                {"name": team["team_name"], "score": k * 3} for k, team in enumerate(teams)
+            ]},
+            "status": "playing",
+            "winner_data": None,
+            "version": 1000 + scheduled_id,
+            "updated_at": "2026-01-15T10:00:00+00:00",
+            "created_at": "2026-01-15T09:00:00+00:00"
+        })
+
+    return tables
+
+
+class FestivalQuery:
+    """Applies eq() and in_() filters; every other builder call is accepted and ignored"""
+
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.filters = []
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def in_(self, column, values):
+        values = set(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        time.sleep(self.client.latency)
+        rows = [row for row in self.client.tables[self.table] if all(f(row) for f in self.filters)]
+        return SimpleNamespace(data=rows, count=len(rows))
+
+
+class FestivalClient:
+    """Read-only client over festival_dataset() tables, latency seconds per query"""
+
+    def __init__(self, tables, latency=0.0):
+        self.tables = tables
+        self.latency = latency
+
+    def table(self, name):
+        return FestivalQuery(self, name)
@@ -1,13 +1,34 @@
-from fastapi import FastAPI, HTTPException, Depends, Header
+from fastapi import FastAPI, HTTPException, Depends, Header, Request, Response, Query
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
+from starlette.datastructures import Headers
+from pydantic import BaseModel, ValidationError
 from typing import List, Optional
-from datetime import datetime, date, timedelta
+from datetime import datetime, date, timedelta, timezone
 from supabase import create_client, Client
 import os
 from dotenv import load_dotenv
+from ranking import MEDALS, medal, ranked
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import base64
+import binascii
+import csv
+import io
+import gzip
+import json
 import secrets
 import hashlib
+import hmac
 
 # Load environment variables
 load_dotenv()
@@ -22,10 +43,44 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Responses smaller than COMPRESSION_MIN_SIZE bytes (health checks, score taps)
+# are sent as-is; cached payloads are compressed once in cached_payload_response
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", "6"))
+
+def accepted_encodings(accept_encoding: Optional[str]):
+    """Return the content codings an Accept-Encoding header allows, leaving out any sent with q=0"""
+    codings = {}
+    for token in (accept_encoding or "").lower().split(","):
+        coding, *params = [part.strip() for part in token.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            codings[coding] = quality
+    
+    star = codings.pop("*", 0.0)
+    return {coding for coding in ("br", "gzip") if codings.get(coding, star) > 0}
+
+class AcceptEncodingGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that leaves the response alone when the client sent gzip;q=0"""
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and "gzip" not in accepted_encodings(Headers(scope=scope).get("accept-encoding")):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+app.add_middleware(AcceptEncodingGZipMiddleware, minimum_size=COMPRESSION_MIN_SIZE, compresslevel=COMPRESSION_LEVEL)
+
 
-active_sessions = {}
 ADMIN_USERNAME = os.getenv("ADMIN_USERNAME", "admin")
 ADMIN_PASSWORD_HASH = hashlib.sha256(
     os.getenv("ADMIN_PASSWORD", "pongal2026").encode()
@@ -42,6 +97,261 @@ def get_supabase() -> Client:
 
 supabase: Client = get_supabase()
 
+# The supabase client is synchronous, so every query is run on a bounded
+# thread pool instead of blocking the event loop.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "16"))
+db_executor = ThreadPoolExecutor(max_workers=DB_POOL_SIZE, thread_name_prefix="supabase")
+
+async def run_query(query):
+    """Execute a supabase query builder off the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(db_executor, query.execute)
+
+# ==================== FAST JSON RESPONSES ====================
+
+# Hot read routes return FastJSONResponse, which skips jsonable_encoder and
+# response_model validation of rows that come straight from the database,
+# and uses orjson when it is installed. Remove a route group from
+# FAST_JSON_ROUTES to send it through the normal FastAPI path again.
+FAST_JSON_ROUTES = {
+    route.strip()
+    for route in os.getenv(
+        "FAST_JSON_ROUTES", "live-games,results,scheduled-games,dashboard,registrations"
+    ).split(",")
+    if route.strip()
+}
+
+def dumps_json(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=str, ensure_ascii=False, separators=(",", ":")).encode()
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+    
+    def render(self, content) -> bytes:
+        return dumps_json(content)
+
+def json_response(route: str, content, response: Optional[Response] = None):
+    """Serialize content directly when the route group is on the fast path"""
+    if route not in FAST_JSON_ROUTES:
+        return content
+    return FastJSONResponse(content, headers=response.headers if response else None)
+
+# ==================== SESSION STORE ====================
+
+# Admin sessions live in memory by default. Set SESSION_STORE=supabase to
+# keep them in the admin_sessions table so every uvicorn worker accepts
+# tokens issued by any other. Those tables have row level security with no
+# policies, so the store uses its own client with SUPABASE_SERVICE_KEY (the
+# service_role key, which bypasses RLS) rather than the anon SUPABASE_KEY.
+SESSION_STORE = os.getenv("SESSION_STORE", "memory")
+SESSION_TTL = timedelta(hours=24)
+SESSION_SWEEP_INTERVAL_SECONDS = int(os.getenv("SESSION_SWEEP_INTERVAL_SECONDS", "300"))
+
+class MemorySessionStore:
+    """Sessions kept in this process only"""
+    
+    def __init__(self):
+        self.sessions = {}
+        self.revocations = {}
+    
+    async def get(self, token: str):
+        return self.sessions.get(token)
+    
+    async def put(self, token: str, session: dict):
+        self.sessions[token] = session
+    
+    async def delete(self, token: str):
+        self.sessions.pop(token, None)
+    
+    async def sweep(self):
+        now = datetime.now(timezone.utc)
+        for token in [t for t, session in self.sessions.items() if session["expires_at"] <= now]:
+            del self.sessions[token]
+        for token_id in [t for t, expires_at in self.revocations.items() if expires_at <= now]:
+            del self.revocations[token_id]
+    
+    async def revoke(self, token_id: str, expires_at: datetime):
+        self.revocations[token_id] = expires_at
+    
+    async def load_revocations(self):
+        return dict(self.revocations)
+
+class SupabaseSessionStore:
+    """Sessions kept in the admin_sessions table, shared by every worker"""
+    
+    def __init__(self, client: Client):
+        self.client = client
+    
+    @staticmethod
+    def token_hash(token: str):
+        # Only a hash of the token is stored, so a leaked table can't be replayed
+        return hashlib.sha256(token.encode()).hexdigest()
+    
+    async def get(self, token: str):
+        response = await run_query(self.client.table("admin_sessions").select(
+            "username, created_at, expires_at"
+        ).eq("token_hash", self.token_hash(token)))
+        
+        if not response.data:
+            return None
+        
+        row = response.data[0]
+        return {
+            "username": row["username"],
+            "created_at": datetime.fromisoformat(row["created_at"]),
+            "expires_at": datetime.fromisoformat(row["expires_at"])
+        }
+    
+    async def put(self, token: str, session: dict):
+        await run_query(self.client.table("admin_sessions").insert({
+            "token_hash": self.token_hash(token),
+            "username": session["username"],
+            "created_at": session["created_at"].isoformat(),
+            "expires_at": session["expires_at"].isoformat()
+        }))
+    
+    async def delete(self, token: str):
+        await run_query(self.client.table("admin_sessions").delete().eq(
+            "token_hash", self.token_hash(token)
+        ))
+    
+    async def sweep(self):
+        now = datetime.now(timezone.utc).isoformat()
+        await run_query(self.client.table("admin_sessions").delete().lt("expires_at", now))
+        await run_query(self.client.table("revoked_admin_tokens").delete().lt("expires_at", now))
+    
+    async def revoke(self, token_id: str, expires_at: datetime):
+        await run_query(self.client.table("revoked_admin_tokens").upsert({
+            "token_id": token_id,
+            "expires_at": expires_at.isoformat()
+        }, on_conflict="token_id"))
+    
+    async def load_revocations(self):
+        response = await run_query(self.client.table("revoked_admin_tokens").select(
+            "token_id, expires_at"
+        ).gt("expires_at", datetime.now(timezone.utc).isoformat()))
+        return {row["token_id"]: datetime.fromisoformat(row["expires_at"]) for row in response.data}
+
+if SESSION_STORE == "supabase":
+    if not os.getenv("SUPABASE_SERVICE_KEY"):
+        raise ValueError("SESSION_STORE=supabase needs SUPABASE_SERVICE_KEY (the service_role key)")
+    session_store = SupabaseSessionStore(create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_SERVICE_KEY")))
+elif SESSION_STORE == "memory":
+    session_store = MemorySessionStore()
+else:
+    raise ValueError("SESSION_STORE must be 'memory' or 'supabase'")
+
+# ==================== SIGNED ADMIN TOKENS ====================
+
+# With ADMIN_TOKEN_MODE=signed the token itself carries the username and
+# expiry, signed with ADMIN_TOKEN_SECRET, so verifying it needs no session
+# lookup. Logged-out tokens go on a revocation list that every worker
+# reloads from the session store every REVOCATION_RELOAD_SECONDS, so another
+# worker may accept a logged-out token for up to that long. With the default
+# SESSION_STORE=memory the list is not shared at all: a logout only takes
+# effect on the worker that handled it, so run a single worker or use
+# SESSION_STORE=supabase.
+ADMIN_TOKEN_MODE = os.getenv("ADMIN_TOKEN_MODE", "session")
+ADMIN_TOKEN_SECRET = os.getenv("ADMIN_TOKEN_SECRET", "")
+REVOCATION_RELOAD_SECONDS = float(os.getenv("REVOCATION_RELOAD_SECONDS", "5"))
+revoked_tokens = {}
+
+if ADMIN_TOKEN_MODE not in ("session", "signed"):
+    raise ValueError("ADMIN_TOKEN_MODE must be 'session' or 'signed'")
+if ADMIN_TOKEN_MODE == "signed" and not ADMIN_TOKEN_SECRET:
+    raise ValueError("ADMIN_TOKEN_SECRET must be set when ADMIN_TOKEN_MODE is 'signed'")
+
+def b64url_encode(data: bytes):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+def b64url_decode(data: str):
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+def sign_token_payload(payload: str):
+    return b64url_encode(hmac.new(ADMIN_TOKEN_SECRET.encode(), payload.encode(), hashlib.sha256).digest())
+
+def issue_signed_token(username: str, expires_at: datetime):
+    payload = b64url_encode(json.dumps({
+        "sub": username,
+        "exp": int(expires_at.timestamp()),
+        "jti": secrets.token_urlsafe(12)
+    }, separators=(",", ":")).encode())
+    return f"{payload}.{sign_token_payload(payload)}"
+
+def read_signed_token(token: str):
+    """Return the claims of a correctly signed token, or None"""
+    payload, _, signature = token.partition(".")
+    # Compared as bytes: compare_digest raises TypeError on non-ASCII str
+    if not signature or not hmac.compare_digest(signature.encode(), sign_token_payload(payload).encode()):
+        return None
+    
+    try:
+        claims = json.loads(b64url_decode(payload))
+    except (ValueError, binascii.Error):
+        return None
+    if not isinstance(claims, dict) or not {"sub", "exp", "jti"} <= claims.keys():
+        return None
+    return claims
+
+def verify_signed_token(token: str):
+    claims = read_signed_token(token)
+    if not claims or claims["jti"] in revoked_tokens:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    
+    expires_at = datetime.fromtimestamp(claims["exp"], timezone.utc)
+    if datetime.now(timezone.utc) > expires_at:
+        raise HTTPException(status_code=401, detail="Token expired")
+    
+    return {"username": claims["sub"], "expires_at": expires_at}
+
+async def revoke_signed_token(token: str):
+    claims = read_signed_token(token)
+    if not claims:
+        return
+    
+    expires_at = datetime.fromtimestamp(claims["exp"], timezone.utc)
+    revoked_tokens[claims["jti"]] = expires_at
+    await session_store.revoke(claims["jti"], expires_at)
+
+session_sweeper = {"task": None, "revocations": None}
+
+async def session_sweep_loop():
+    while True:
+        await asyncio.sleep(SESSION_SWEEP_INTERVAL_SECONDS)
+        try:
+            await session_store.sweep()
+        except Exception:
+            # Expired sessions are still rejected on lookup; try again next time
+            pass
+
+async def revocation_reload_loop():
+    while True:
+        await asyncio.sleep(REVOCATION_RELOAD_SECONDS)
+        try:
+            # Pick up tokens revoked by other workers and forget expired ones
+            now = datetime.now(timezone.utc)
+            revocations = await session_store.load_revocations()
+            revocations.update(revoked_tokens)
+            revoked_tokens.clear()
+            revoked_tokens.update({t: exp for t, exp in revocations.items() if exp > now})
+        except Exception:
+            # Keep the current list and try again next time
+            pass
+
+@app.on_event("startup")
+async def start_session_sweeper():
+    session_sweeper["task"] = asyncio.create_task(session_sweep_loop())
+    if ADMIN_TOKEN_MODE == "signed":
+        session_sweeper["revocations"] = asyncio.create_task(revocation_reload_loop())
+
+@app.on_event("shutdown")
+async def stop_session_sweeper():
+    for task in (session_sweeper["task"], session_sweeper["revocations"]):
+        if task:
+            task.cancel()
+
 class LoginRequest(BaseModel):
     username: str
     password: str
@@ -212,6 +522,8 @@ class ScheduledGame(BaseModel):
     team1_id: Optional[int] = None
     team2_id: Optional[int] = None
     parent_game_id: Optional[int] = None
+    next_match_id: Optional[int] = None
+    bracket_slot: Optional[int] = None
     created_at: Optional[datetime] = None
 
     class Config:
@@ -220,6 +532,15 @@ class ScheduledGame(BaseModel):
 class PlayerUpdate(BaseModel):
     player_name: str
 
+class BracketCreate(BaseModel):
+    format: str = "single_elimination"
+    dates: List[str]
+    venues: List[str]
+    start_time: str
+    match_minutes: int = 30
+    max_players_per_team: Optional[int] = None
+    team_ids: Optional[List[int]] = None
+
 # API Routes
 
 @app.get("/")
@@ -234,13 +555,16 @@ async def verify_admin_token(authorization: Optional[str] = Header(None)):
     
     token = authorization.replace("Bearer ", "")
     
-    if token not in active_sessions:
+    if ADMIN_TOKEN_MODE == "signed":
+        return verify_signed_token(token)
+    
+    session = await session_store.get(token)
+    if not session:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
     
     # Check if token is expired (24 hours)
-    session = active_sessions[token]
-    if datetime.now() > session["expires_at"]:
-        del active_sessions[token]
+    if datetime.now(timezone.utc) > session["expires_at"]:
+        await session_store.delete(token)
         raise HTTPException(status_code=401, detail="Token expired")
     
     return session
@@ -256,15 +580,23 @@ async def login(credentials: LoginRequest):
     if credentials.username != ADMIN_USERNAME or password_hash != ADMIN_PASSWORD_HASH:
         raise HTTPException(status_code=401, detail="Invalid username or password")
     
+    now = datetime.now(timezone.utc)
+    
+    if ADMIN_TOKEN_MODE == "signed":
+        return LoginResponse(
+            token=issue_signed_token(credentials.username, now + SESSION_TTL),
+            message="Login successful"
+        )
+    
     # Generate session token
     token = secrets.token_urlsafe(32)
     
     # Store session (expires in 24 hours)
-    active_sessions[token] = {
+    await session_store.put(token, {
         "username": credentials.username,
-        "created_at": datetime.now(),
-        "expires_at": datetime.now() + timedelta(hours=24)
-    }
+        "created_at": now,
+        "expires_at": now + SESSION_TTL
+    })
     
     return LoginResponse(
         token=token,
@@ -279,8 +611,10 @@ async def logout(authorization: Optional[str] = Header(None)):
     
     token = authorization.replace("Bearer ", "")
     
-    if token in active_sessions:
-        del active_sessions[token]
+    if ADMIN_TOKEN_MODE == "signed":
+        await revoke_signed_token(token)
+    else:
+        await session_store.delete(token)
     
     return {"message": "Logged out successfully"}
 
@@ -297,7 +631,8 @@ async def verify_token(session = Depends(verify_admin_token)):
 async def create_game(game: dict, session = Depends(verify_admin_token)):
     """Create a new game (Protected)"""
     try:
-        response = supabase.table("games").insert(game).execute()
+        response = await run_query(supabase.table("games").insert(game))
+        invalidate_catalogue()
         return response.data[0]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -306,10 +641,10 @@ async def create_game(game: dict, session = Depends(verify_admin_token)):
 async def create_scheduled_game(scheduled_game: dict, session = Depends(verify_admin_token)):
     """Create a new scheduled game (Protected)"""
     try:
-        response = supabase.table("scheduled_games").insert(scheduled_game).execute()
-        result = supabase.table("scheduled_games").select(
+        response = await run_query(supabase.table("scheduled_games").insert(scheduled_game))
+        result = await run_query(supabase.table("scheduled_games").select(
             "*, games(*)"
-        ).eq("id", response.data[0]["id"]).execute()
+        ).eq("id", response.data[0]["id"]))
         return result.data[0]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -318,9 +653,11 @@ async def create_scheduled_game(scheduled_game: dict, session = Depends(verify_a
 async def delete_game(game_id: int, session = Depends(verify_admin_token)):
     """Delete a game (Protected)"""
     try:
-        response = supabase.table("games").delete().eq("id", game_id).execute()
+        response = await run_query(supabase.table("games").delete().eq("id", game_id))
         if not response.data:
             raise HTTPException(status_code=404, detail="Game not found")
+        invalidate_catalogue()
+        invalidate_scoreboard()
         return {"message": "Game deleted successfully"}
     except HTTPException:
         raise
@@ -331,9 +668,10 @@ async def delete_game(game_id: int, session = Depends(verify_admin_token)):
 async def delete_scheduled_game(scheduled_game_id: int, session = Depends(verify_admin_token)):
     """Delete a scheduled game (Protected)"""
     try:
-        response = supabase.table("scheduled_games").delete().eq("id", scheduled_game_id).execute()
+        response = await run_query(supabase.table("scheduled_games").delete().eq("id", scheduled_game_id))
         if not response.data:
             raise HTTPException(status_code=404, detail="Scheduled game not found")
+        invalidate_scoreboard()
         return {"message": "Scheduled game deleted successfully"}
     except HTTPException:
         raise
@@ -341,23 +679,117 @@ async def delete_scheduled_game(scheduled_game_id: int, session = Depends(verify
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# ==================== GAMES CATALOGUE CACHE ====================
+
+# The games table barely changes during an event, so it is read once and
+# served from memory. Game create/delete routes drop the cache and the TTL
+# picks up changes made by other workers or directly in the database.
+# Responses carry a strong ETag so browsers revalidate with a 304.
+CATALOGUE_TTL_SECONDS = float(os.getenv("CATALOGUE_TTL_SECONDS", "300"))
+catalogue_cache = {"games": None, "loaded_at": 0.0, "responses": {}, "generation": 0}
+catalogue_lock = asyncio.Lock()
+GAME_CATEGORIES = ("main", "kids", "women", "men", "fun")
+
+async def get_catalogue():
+    """Return every game, loading the catalogue when missing or stale"""
+    loop = asyncio.get_running_loop()
+    if catalogue_cache["games"] is not None and loop.time() - catalogue_cache["loaded_at"] < CATALOGUE_TTL_SECONDS:
+        return catalogue_cache["games"]
+    
+    async with catalogue_lock:
+        # Reload again if a game was added or deleted while the query ran,
+        # so the old list is never stored under the new state
+        for _ in range(3):
+            if catalogue_cache["games"] is not None and loop.time() - catalogue_cache["loaded_at"] < CATALOGUE_TTL_SECONDS:
+                return catalogue_cache["games"]
+            
+            generation = catalogue_cache["generation"]
+            response = await run_query(supabase.table("games").select("*").order("id"))
+            if generation == catalogue_cache["generation"]:
+                catalogue_cache["games"] = response.data
+                catalogue_cache["loaded_at"] = loop.time()
+                catalogue_cache["responses"] = {}
+                return response.data
+        return response.data
+
+def invalidate_catalogue():
+    catalogue_cache["generation"] += 1
+    catalogue_cache["games"] = None
+    catalogue_cache["responses"] = {}
+
+def etag_matches(if_none_match: Optional[str], etag: str):
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+def cached_payload(content):
+    body = dumps_json(content)
+    return {"body": body, "etag": '"' + hashlib.sha256(body).hexdigest()[:32] + '"'}
+
+def cached_payload_response(request: Request, cached: dict, headers: Optional[dict] = None):
+    """Answer 304 or send the cached body, compressing it at most once per encoding"""
+    headers = {"ETag": cached["etag"], "Vary": "Accept-Encoding", **(headers or {})}
+    if etag_matches(request.headers.get("if-none-match"), cached["etag"]):
+        return Response(status_code=304, headers=headers)
+    
+    body = cached["body"]
+    if len(body) < COMPRESSION_MIN_SIZE:
+        return Response(content=body, media_type="application/json", headers=headers)
+    
+    accepted = accepted_encodings(request.headers.get("accept-encoding"))
+    if brotli is not None and "br" in accepted:
+        encoding = "br"
+    elif "gzip" in accepted:
+        encoding = "gzip"
+    else:
+        return Response(content=body, media_type="application/json", headers=headers)
+    
+    # The cached dict is replaced on invalidation, so these never go stale
+    if encoding not in cached:
+        if encoding == "br":
+            cached[encoding] = brotli.compress(body)
+        else:
+            cached[encoding] = gzip.compress(body, compresslevel=COMPRESSION_LEVEL)
+    headers["Content-Encoding"] = encoding
+    return Response(content=cached[encoding], media_type="application/json", headers=headers)
+
+def catalogue_response(request: Request, key: str, content):
+    """Serve catalogue content with a strong ETag, answering 304 when the client has it"""
+    cached = catalogue_cache["responses"].get(key)
+    if cached is None:
+        cached = cached_payload(content)
+        # Content from a load that lost a race with an invalidation isn't kept
+        if catalogue_cache["games"] is not None:
+            catalogue_cache["responses"][key] = cached
+    return cached_payload_response(request, cached, {"Cache-Control": "no-cache"})
+
+@app.on_event("startup")
+async def load_catalogue():
+    try:
+        await get_catalogue()
+    except Exception:
+        # The first request will try again
+        pass
+
 @app.get("/games", response_model=List[Game])
-async def get_games():
+async def get_games(request: Request):
     """Get all games"""
     try:
-        response = supabase.table("games").select("*").execute()
-        return response.data
+        games = await get_catalogue()
+        return catalogue_response(request, "all", games)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/games/{game_id}", response_model=Game)
-async def get_game(game_id: int):
+async def get_game(game_id: int, request: Request):
     """Get a specific game by ID"""
     try:
-        response = supabase.table("games").select("*").eq("id", game_id).execute()
-        if not response.data:
+        games = await get_catalogue()
+        game = next((g for g in games if g["id"] == game_id), None)
+        if not game:
             raise HTTPException(status_code=404, detail="Game not found")
-        return response.data[0]
+        return catalogue_response(request, f"game:{game_id}", game)
     except HTTPException:
         raise
     except Exception as e:
@@ -367,12 +799,13 @@ async def get_game(game_id: int):
 async def create_game(game: GameCreate):
     """Create a new game"""
     try:
-        response = supabase.table("games").insert({
+        response = await run_query(supabase.table("games").insert({
             "icon": game.icon,
             "tamil": game.tamil,
             "english": game.english,
             "category": game.category
-        }).execute()
+        }))
+        invalidate_catalogue()
         return response.data[0]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -381,25 +814,109 @@ async def create_game(game: GameCreate):
 async def delete_game(game_id: int):
     """Delete a game"""
     try:
-        response = supabase.table("games").delete().eq("id", game_id).execute()
+        response = await run_query(supabase.table("games").delete().eq("id", game_id))
         if not response.data:
             raise HTTPException(status_code=404, detail="Game not found")
+        invalidate_catalogue()
+        invalidate_scoreboard()
         return {"message": "Game deleted successfully"}
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# ==================== PAGINATION ====================
+
+# List endpoints return everything unless a limit is given. With a limit
+# they return one page ordered by a unique key and put the cursor for the
+# next page in the X-Next-Cursor header.
+MAX_PAGE_SIZE = 500
+
+SCHEDULED_GAME_FIELDS = {field: field for field in ScheduledGame.model_fields}
+SCHEDULED_GAME_FIELDS["games"] = "games(*)"
+TEAM_REGISTRATION_FIELDS = {field: field for field in TeamRegistration.model_fields}
+INDIVIDUAL_REGISTRATION_FIELDS = {field: field for field in IndividualRegistration.model_fields}
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values, default=str).encode()).decode()
+
+def decode_cursor(cursor: str, size: int):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+def quote_filter_value(value):
+    """Quote a value for use inside a PostgREST or() filter"""
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+def paginate(query, keys: List[str], limit: int, cursor: Optional[str] = None, desc: bool = False):
+    """Order a query by the given keys and return the page that follows the cursor"""
+    for key in keys:
+        query = query.order(key, desc=desc)
+    
+    if cursor:
+        values = decode_cursor(cursor, len(keys))
+        op = "lt" if desc else "gt"
+        
+        # (a, b, c) > (x, y, z) spelled out as PostgREST filters
+        clauses = []
+        for idx, key in enumerate(keys):
+            parts = [f"{k}.eq.{quote_filter_value(v)}" for k, v in zip(keys[:idx], values[:idx])]
+            parts.append(f"{key}.{op}.{quote_filter_value(values[idx])}")
+            clauses.append(parts[0] if len(parts) == 1 else f"and({','.join(parts)})")
+        query = query.or_(",".join(clauses))
+    
+    return query.limit(limit)
+
+def next_cursor(rows, keys: List[str], limit: Optional[int]):
+    """Cursor for the page after rows, or None when this was the last page"""
+    if not limit or len(rows) < limit:
+        return None
+    return encode_cursor([rows[-1][key] for key in keys])
+
+def select_fields(fields: Optional[str], allowed: dict, required: List[str], default: str):
+    """Turn a comma-separated fields parameter into a select limited to known columns"""
+    if not fields:
+        return default
+    
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    
+    return ", ".join(allowed[field] for field in dict.fromkeys(required + requested))
+
 # ==================== SCHEDULED GAMES ENDPOINTS ====================
 
 @app.get("/scheduled-games", response_model=List[dict])
-async def get_scheduled_games():
+async def get_scheduled_games(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
+):
     """Get all scheduled games with game details"""
     try:
-        response = supabase.table("scheduled_games").select(
-            "*, games(*)"
-        ).execute()
-        return response.data
+        keys = ["date", "scheduled_time", "id"]
+        query = supabase.table("scheduled_games").select(
+            select_fields(fields, SCHEDULED_GAME_FIELDS, keys if limit else [], "*, games(*)")
+        )
+        if limit:
+            query = paginate(query, keys, limit, cursor)
+        
+        result = await run_query(query)
+        
+        page_cursor = next_cursor(result.data, keys, limit)
+        if page_cursor:
+            response.headers["X-Next-Cursor"] = page_cursor
+        return json_response("scheduled-games", result.data, response)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -407,9 +924,9 @@ async def get_scheduled_games():
 async def get_active_games():
     """Get all active games"""
     try:
-        response = supabase.table("scheduled_games").select(
+        response = await run_query(supabase.table("scheduled_games").select(
             "*, games(*)"
-        ).eq("is_active", True).execute()
+        ).eq("is_active", True))
         return response.data
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -418,9 +935,9 @@ async def get_active_games():
 async def get_open_registration_games():
     """Get all games with open registration"""
     try:
-        response = supabase.table("scheduled_games").select(
+        response = await run_query(supabase.table("scheduled_games").select(
             "*, games(*)"
-        ).eq("registration_open", True).execute()
+        ).eq("registration_open", True))
         return response.data
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -429,9 +946,9 @@ async def get_open_registration_games():
 async def get_scheduled_game(scheduled_game_id: int):
     """Get a specific scheduled game"""
     try:
-        response = supabase.table("scheduled_games").select(
+        response = await run_query(supabase.table("scheduled_games").select(
             "*, games(*)"
-        ).eq("id", scheduled_game_id).execute()
+        ).eq("id", scheduled_game_id))
         if not response.data:
             raise HTTPException(status_code=404, detail="Scheduled game not found")
         return response.data[0]
@@ -444,11 +961,11 @@ async def get_scheduled_game(scheduled_game_id: int):
 async def create_scheduled_game(scheduled_game: ScheduledGameCreate):
     """Create a new scheduled game"""
     try:
-        game_response = supabase.table("games").select("*").eq("id", scheduled_game.game_id).execute()
+        game_response = await run_query(supabase.table("games").select("*").eq("id", scheduled_game.game_id))
         if not game_response.data:
             raise HTTPException(status_code=404, detail="Game not found")
         
-        response = supabase.table("scheduled_games").insert({
+        response = await run_query(supabase.table("scheduled_games").insert({
             "game_id": scheduled_game.game_id,
             "scheduled_time": scheduled_game.scheduled_time,
             "date": scheduled_game.date,
@@ -459,11 +976,11 @@ async def create_scheduled_game(scheduled_game: ScheduledGameCreate):
             "registration_open": True,
             "max_teams": scheduled_game.max_teams,
             "max_players_per_team": scheduled_game.max_players_per_team
-        }).execute()
+        }))
         
-        result = supabase.table("scheduled_games").select(
+        result = await run_query(supabase.table("scheduled_games").select(
             "*, games(*)"
-        ).eq("id", response.data[0]["id"]).execute()
+        ).eq("id", response.data[0]["id"]))
         
         return result.data[0]
     except HTTPException:
@@ -480,16 +997,18 @@ async def update_scheduled_game(scheduled_game_id: int, update: ScheduledGameUpd
         if not update_data:
             raise HTTPException(status_code=400, detail="No fields to update")
         
-        response = supabase.table("scheduled_games").update(
+        response = await run_query(supabase.table("scheduled_games").update(
             update_data
-        ).eq("id", scheduled_game_id).execute()
+        ).eq("id", scheduled_game_id))
         
         if not response.data:
             raise HTTPException(status_code=404, detail="Scheduled game not found")
         
-        result = supabase.table("scheduled_games").select(
+        invalidate_scoreboard()
+        
+        result = await run_query(supabase.table("scheduled_games").select(
             "*, games(*)"
-        ).eq("id", scheduled_game_id).execute()
+        ).eq("id", scheduled_game_id))
         
         return result.data[0]
     except HTTPException:
@@ -501,15 +1020,17 @@ async def update_scheduled_game(scheduled_game_id: int, update: ScheduledGameUpd
 async def toggle_game_activation(scheduled_game_id: int):
     """Toggle game activation status"""
     try:
-        current = supabase.table("scheduled_games").select("is_active").eq("id", scheduled_game_id).execute()
+        current = await run_query(supabase.table("scheduled_games").select("is_active").eq("id", scheduled_game_id))
         if not current.data:
             raise HTTPException(status_code=404, detail="Scheduled game not found")
         
         new_status = not current.data[0]["is_active"]
         
-        response = supabase.table("scheduled_games").update({
+        response = await run_query(supabase.table("scheduled_games").update({
             "is_active": new_status
-        }).eq("id", scheduled_game_id).execute()
+        }).eq("id", scheduled_game_id))
+        
+        invalidate_scoreboard()
         
         return {"id": scheduled_game_id, "is_active": new_status}
     except HTTPException:
@@ -521,15 +1042,21 @@ async def toggle_game_activation(scheduled_game_id: int):
 async def toggle_registration(scheduled_game_id: int):
     """Toggle registration open/close status"""
     try:
-        current = supabase.table("scheduled_games").select("registration_open").eq("id", scheduled_game_id).execute()
+        current = await run_query(supabase.table("scheduled_games").select("registration_open").eq("id", scheduled_game_id))
         if not current.data:
             raise HTTPException(status_code=404, detail="Scheduled game not found")
         
         new_status = not current.data[0]["registration_open"]
         
-        response = supabase.table("scheduled_games").update({
-            "registration_open": new_status
-        }).eq("id", scheduled_game_id).execute()
+        update_data = {"registration_open": new_status}
+        if new_status:
+            # Every API process reads this to start its own surge window
+            opened_at = datetime.now(timezone.utc)
+            update_data["registration_opened_at"] = opened_at.isoformat()
+        
+        response = await run_query(supabase.table("scheduled_games").update(update_data).eq("id", scheduled_game_id))
+        if new_status:
+            start_registration_surge(opened_at)
         
         return {"id": scheduled_game_id, "registration_open": new_status}
     except HTTPException:
@@ -541,9 +1068,10 @@ async def toggle_registration(scheduled_game_id: int):
 async def delete_scheduled_game(scheduled_game_id: int):
     """Delete a scheduled game"""
     try:
-        response = supabase.table("scheduled_games").delete().eq("id", scheduled_game_id).execute()
+        response = await run_query(supabase.table("scheduled_games").delete().eq("id", scheduled_game_id))
         if not response.data:
             raise HTTPException(status_code=404, detail="Scheduled game not found")
+        invalidate_scoreboard()
         return {"message": "Scheduled game deleted successfully"}
     except HTTPException:
         raise
@@ -553,70 +1081,76 @@ async def delete_scheduled_game(scheduled_game_id: int):
 # ==================== TEAM REGISTRATION ENDPOINTS ====================
 
 @app.get("/team-registrations/{scheduled_game_id}", response_model=List[TeamRegistration])
-async def get_team_registrations(scheduled_game_id: int):
+async def get_team_registrations(
+    scheduled_game_id: int,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
+):
     """Get all team registrations for a scheduled game"""
     try:
-        response = supabase.table("team_registrations").select("*").eq(
-            "scheduled_game_id", scheduled_game_id
-        ).execute()
-        return response.data
+        keys = ["registered_at", "id"]
+        query = supabase.table("team_registrations").select(
+            select_fields(fields, TEAM_REGISTRATION_FIELDS, keys if limit else [], "*")
+        ).eq("scheduled_game_id", scheduled_game_id)
+        if limit:
+            query = paginate(query, keys, limit, cursor)
+        
+        result = await run_query(query)
+        
+        page_cursor = next_cursor(result.data, keys, limit)
+        if page_cursor:
+            response.headers["X-Next-Cursor"] = page_cursor
+        
+        # Partial rows can't satisfy the response model
+        if fields:
+            return FastJSONResponse(result.data, headers=response.headers)
+        return json_response("registrations", result.data, response)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # Replace the team registration endpoint in main.py with this updated version
 
+# Error codes returned by the register_team database function
+TEAM_ADMISSION_ERRORS = {
+    "not_found": (404, "Scheduled game not found"),
+    "closed": (400, "Registration is closed for this game"),
+    "wrong_type": (400, "This game is not a team event"),
+    "full": (400, "Maximum teams limit reached"),
+    "duplicate": (400, "Team name already registered"),
+}
+
+async def admit_team(registration: TeamRegistrationCreate):
+    """Check capacity, registration_open and the team name and insert, all in one database call"""
+    response = await run_query(supabase.rpc("register_team", {
+        "p_scheduled_game_id": registration.scheduled_game_id,
+        "p_team_name": registration.team_name,
+        "p_captain_name": registration.captain_name,
+        "p_captain_phone": registration.captain_phone,
+        "p_captain_email": registration.captain_email,
+        "p_players": registration.players
+    }))
+    outcome = response.data
+    
+    if outcome.get("error") == "too_many_players":
+        raise HTTPException(status_code=400, detail=f"Maximum {outcome['limit']} players allowed per team")
+    if outcome.get("error"):
+        status_code, detail = TEAM_ADMISSION_ERRORS[outcome["error"]]
+        raise HTTPException(status_code=status_code, detail=detail)
+    
+    invalidate_scoreboard()
+    return outcome["registration"]
+
 @app.post("/team-registrations", response_model=TeamRegistration)
 async def create_team_registration(registration: TeamRegistrationCreate):
     """Register a team for a scheduled game"""
     try:
-        # Check if game exists and registration is open
-        game = supabase.table("scheduled_games").select("*").eq(
-            "id", registration.scheduled_game_id
-        ).execute()
-        
-        if not game.data:
-            raise HTTPException(status_code=404, detail="Scheduled game not found")
-        
-        if not game.data[0].get("registration_open", True):
-            raise HTTPException(status_code=400, detail="Registration is closed for this game")
-        
-        if game.data[0]["game_type"] != "team":
-            raise HTTPException(status_code=400, detail="This game is not a team event")
-        
-        # Check max teams limit
-        if game.data[0].get("max_teams"):
-            existing = supabase.table("team_registrations").select("id").eq(
-                "scheduled_game_id", registration.scheduled_game_id
-            ).execute()
-            if len(existing.data) >= game.data[0]["max_teams"]:
-                raise HTTPException(status_code=400, detail="Maximum teams limit reached")
-        
-        # Check max players per team limit
-        if game.data[0].get("max_players_per_team"):
-            if len(registration.players) > game.data[0]["max_players_per_team"]:
-                raise HTTPException(
-                    status_code=400, 
-                    detail=f"Maximum {game.data[0]['max_players_per_team']} players allowed per team"
-                )
-        
-        # Check if team name already exists
-        existing_team = supabase.table("team_registrations").select("*").eq(
-            "scheduled_game_id", registration.scheduled_game_id
-        ).eq("team_name", registration.team_name).execute()
-        
-        if existing_team.data:
-            raise HTTPException(status_code=400, detail="Team name already registered")
-        
-        response = supabase.table("team_registrations").insert({
-            "scheduled_game_id": registration.scheduled_game_id,
-            "team_name": registration.team_name,
-            "captain_name": registration.captain_name,
-            "captain_phone": registration.captain_phone,
-            "captain_email": registration.captain_email,
-            "players": registration.players
-        }).execute()
-        
-        return response.data[0]
+        if await registration_surge_active():
+            return await enqueue_registration("team", registration)
+        return await admit_team(registration)
     except HTTPException:
         raise
     except Exception as e:
@@ -626,9 +1160,10 @@ async def create_team_registration(registration: TeamRegistrationCreate):
 async def delete_team_registration(registration_id: int):
     """Delete a team registration"""
     try:
-        response = supabase.table("team_registrations").delete().eq("id", registration_id).execute()
+        response = await run_query(supabase.table("team_registrations").delete().eq("id", registration_id))
         if not response.data:
             raise HTTPException(status_code=404, detail="Registration not found")
+        invalidate_scoreboard()
         return {"message": "Team registration deleted successfully"}
     except HTTPException:
         raise
@@ -638,51 +1173,79 @@ async def delete_team_registration(registration_id: int):
 # ==================== INDIVIDUAL REGISTRATION ENDPOINTS ====================
 
 @app.get("/individual-registrations/{scheduled_game_id}", response_model=List[IndividualRegistration])
-async def get_individual_registrations(scheduled_game_id: int):
+async def get_individual_registrations(
+    scheduled_game_id: int,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
+):
     """Get all individual registrations for a scheduled game"""
     try:
-        response = supabase.table("individual_registrations").select("*").eq(
-            "scheduled_game_id", scheduled_game_id
-        ).execute()
-        return response.data
+        keys = ["registered_at", "id"]
+        query = supabase.table("individual_registrations").select(
+            select_fields(fields, INDIVIDUAL_REGISTRATION_FIELDS, keys if limit else [], "*")
+        ).eq("scheduled_game_id", scheduled_game_id)
+        if limit:
+            query = paginate(query, keys, limit, cursor)
+        
+        result = await run_query(query)
+        
+        page_cursor = next_cursor(result.data, keys, limit)
+        if page_cursor:
+            response.headers["X-Next-Cursor"] = page_cursor
+        
+        # Partial rows can't satisfy the response model
+        if fields:
+            return FastJSONResponse(result.data, headers=response.headers)
+        return json_response("registrations", result.data, response)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+async def admit_individual(registration: IndividualRegistrationCreate):
+    """Check the game and the player name, then insert the registration"""
+    # Check if game exists and registration is open
+    game = await run_query(supabase.table("scheduled_games").select("*").eq(
+        "id", registration.scheduled_game_id
+    ))
+    
+    if not game.data:
+        raise HTTPException(status_code=404, detail="Scheduled game not found")
+    
+    if not game.data[0].get("registration_open", True):
+        raise HTTPException(status_code=400, detail="Registration is closed for this game")
+    
+    if game.data[0]["game_type"] != "individual":
+        raise HTTPException(status_code=400, detail="This game is not an individual event")
+    
+    # Check if player already registered
+    existing = await run_query(supabase.table("individual_registrations").select("*").eq(
+        "scheduled_game_id", registration.scheduled_game_id
+    ).eq("player_name", registration.player_name))
+    
+    if existing.data:
+        raise HTTPException(status_code=400, detail="Player already registered")
+    
+    response = await run_query(supabase.table("individual_registrations").insert({
+        "scheduled_game_id": registration.scheduled_game_id,
+        "player_name": registration.player_name,
+        "phone": registration.phone,
+        "email": registration.email,
+        "age": registration.age
+    }))
+    invalidate_scoreboard()
+    
+    return response.data[0]
+
 @app.post("/individual-registrations", response_model=IndividualRegistration)
 async def create_individual_registration(registration: IndividualRegistrationCreate):
     """Register an individual for a scheduled game"""
     try:
-        # Check if game exists and registration is open
-        game = supabase.table("scheduled_games").select("*").eq(
-            "id", registration.scheduled_game_id
-        ).execute()
-        
-        if not game.data:
-            raise HTTPException(status_code=404, detail="Scheduled game not found")
-        
-        if not game.data[0].get("registration_open", True):
-            raise HTTPException(status_code=400, detail="Registration is closed for this game")
-        
-        if game.data[0]["game_type"] != "individual":
-            raise HTTPException(status_code=400, detail="This game is not an individual event")
-        
-        # Check if player already registered
-        existing = supabase.table("individual_registrations").select("*").eq(
-            "scheduled_game_id", registration.scheduled_game_id
-        ).eq("player_name", registration.player_name).execute()
-        
-        if existing.data:
-            raise HTTPException(status_code=400, detail="Player already registered")
-        
-        response = supabase.table("individual_registrations").insert({
-            "scheduled_game_id": registration.scheduled_game_id,
-            "player_name": registration.player_name,
-            "phone": registration.phone,
-            "email": registration.email,
-            "age": registration.age
-        }).execute()
-        
-        return response.data[0]
+        if await registration_surge_active():
+            return await enqueue_registration("individual", registration)
+        return await admit_individual(registration)
     except HTTPException:
         raise
     except Exception as e:
@@ -692,39 +1255,535 @@ async def create_individual_registration(registration: IndividualRegistrationCre
 async def delete_individual_registration(registration_id: int):
     """Delete an individual registration"""
     try:
-        response = supabase.table("individual_registrations").delete().eq("id", registration_id).execute()
+        response = await run_query(supabase.table("individual_registrations").delete().eq("id", registration_id))
         if not response.data:
             raise HTTPException(status_code=404, detail="Registration not found")
+        invalidate_scoreboard()
         return {"message": "Individual registration deleted successfully"}
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# ==================== BULK REGISTRATION IMPORT ====================
+
+BULK_IMPORT_MAX_ROWS = int(os.getenv("BULK_IMPORT_MAX_ROWS", "2000"))
+
+REGISTRATION_IMPORTS = {
+    "team": {
+        "table": "team_registrations",
+        "model": TeamRegistrationCreate,
+        "name_field": "team_name",
+        "wrong_type": "This game is not a team event",
+        "duplicate": "Team name already registered",
+    },
+    "individual": {
+        "table": "individual_registrations",
+        "model": IndividualRegistrationCreate,
+        "name_field": "player_name",
+        "wrong_type": "This game is not an individual event",
+        "duplicate": "Player already registered",
+    },
+}
+
+async def read_import_rows(request: Request, scheduled_game_id: Optional[int]):
+    """Read a CSV or JSON array body into a list of row dicts"""
+    body = await request.body()
+    if "csv" in request.headers.get("content-type", ""):
+        try:
+            reader = csv.DictReader(io.StringIO(body.decode("utf-8-sig")))
+            rows = [
+                {key.strip(): value.strip() for key, value in row.items() if key and value and value.strip()}
+                for row in reader
+            ]
+        except (UnicodeDecodeError, csv.Error):
+            raise HTTPException(status_code=400, detail="Invalid CSV body")
+        # Players share one cell, separated by semicolons
+        for row in rows:
+            if "players" in row:
+                row["players"] = [player.strip() for player in row["players"].split(";") if player.strip()]
+    else:
+        try:
+            rows = json.loads(body)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid JSON body")
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise HTTPException(status_code=400, detail="Expected a JSON array of registrations")
+    
+    if not rows:
+        raise HTTPException(status_code=400, detail="No registrations to import")
+    if len(rows) > BULK_IMPORT_MAX_ROWS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_IMPORT_MAX_ROWS} registrations per import")
+    
+    if scheduled_game_id is not None:
+        for row in rows:
+            row.setdefault("scheduled_game_id", scheduled_game_id)
+    return rows
+
+async def import_registrations(kind: str, rows: List[dict]):
+    """Validate rows against one prefetch of their games and insert the accepted ones in one call
+    
+    Team rows are inserted through register_teams, which re-checks them with the games locked.
+    """
+    config = REGISTRATION_IMPORTS[kind]
+    name_field = config["name_field"]
+    report = []
+    registrations = []
+    
+    for index, row in enumerate(rows, start=1):
+        try:
+            registrations.append((index, config["model"](**row)))
+        except ValidationError as e:
+            error = e.errors()[0]
+            location = ".".join(str(part) for part in error["loc"])
+            report.append({"row": index, "status": "error", "error": f"{location}: {error['msg']}"})
+    
+    # Games and the names already registered for them come back in one round trip
+    games = {}
+    game_ids = list({registration.scheduled_game_id for _, registration in registrations})
+    if game_ids:
+        games_response = await run_query(supabase.table("scheduled_games").select(
+            f"*, {config['table']}({name_field})"
+        ).in_("id", game_ids))
+        games = {game["id"]: game for game in games_response.data}
+    
+    taken = {
+        game_id: {entry[name_field] for entry in game.get(config["table"]) or []}
+        for game_id, game in games.items()
+    }
+    accepted = []
+    for index, registration in registrations:
+        game = games.get(registration.scheduled_game_id)
+        name = getattr(registration, name_field)
+        if not game:
+            error = "Scheduled game not found"
+        elif not game.get("registration_open", True):
+            error = "Registration is closed for this game"
+        elif game["game_type"] != kind:
+            error = config["wrong_type"]
+        elif kind == "team" and game.get("max_players_per_team") and len(registration.players) > game["max_players_per_team"]:
+            error = f"Maximum {game['max_players_per_team']} players allowed per team"
+        elif name in taken[game["id"]]:
+            error = config["duplicate"]
+        elif kind == "team" and game.get("max_teams") and len(taken[game["id"]]) >= game["max_teams"]:
+            error = "Maximum teams limit reached"
+        else:
+            error = None
+        
+        if error:
+            report.append({"row": index, "status": "error", "error": error})
+            continue
+        taken[game["id"]].add(name)
+        accepted.append((index, registration))
+    
+    inserted = 0
+    if accepted and kind == "team":
+        # The checks above are against a snapshot; register_teams locks the games
+        # and has the final say, like register_team does for a single sign-up
+        response = await run_query(supabase.rpc("register_teams", {
+            "p_teams": [registration.dict() for _, registration in accepted]
+        }))
+        for (index, _), outcome in zip(accepted, response.data):
+            if outcome.get("registration"):
+                inserted += 1
+                report.append({"row": index, "status": "inserted", "id": outcome["registration"]["id"]})
+            elif outcome.get("error") == "too_many_players":
+                report.append({"row": index, "status": "error", "error": f"Maximum {outcome['limit']} players allowed per team"})
+            else:
+                report.append({"row": index, "status": "error", "error": TEAM_ADMISSION_ERRORS[outcome["error"]][1]})
+    elif accepted:
+        response = await run_query(supabase.table(config["table"]).insert([
+            registration.dict() for _, registration in accepted
+        ]))
+        for (index, _), row in zip(accepted, response.data):
+            inserted += 1
+            report.append({"row": index, "status": "inserted", "id": row["id"]})
+    if inserted:
+        invalidate_scoreboard()
+    
+    report.sort(key=lambda entry: entry["row"])
+    return {"inserted": inserted, "failed": len(rows) - inserted, "rows": report}
+
+@app.post("/team-registrations/bulk")
+async def bulk_create_team_registrations(
+    request: Request,
+    scheduled_game_id: Optional[int] = None,
+    session = Depends(verify_admin_token)
+):
+    """Import team registrations from CSV or a JSON array"""
+    try:
+        rows = await read_import_rows(request, scheduled_game_id)
+        return await import_registrations("team", rows)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/individual-registrations/bulk")
+async def bulk_create_individual_registrations(
+    request: Request,
+    scheduled_game_id: Optional[int] = None,
+    session = Depends(verify_admin_token)
+):
+    """Import individual registrations from CSV or a JSON array"""
+    try:
+        rows = await read_import_rows(request, scheduled_game_id)
+        return await import_registrations("individual", rows)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# ==================== REGISTRATION SURGE QUEUE ====================
+
+# REGISTRATION_SURGE_MODE: "off" registers inline, "auto" queues registrations
+# for REGISTRATION_SURGE_WINDOW_SECONDS after registration is opened, "always"
+# queues every registration. Queued registrations answer 202 with a ticket id
+# and are admitted by REGISTRATION_WORKERS workers at no more than
+# REGISTRATION_RATE_PER_SECOND in total (per uvicorn worker process). Ticket
+# outcomes are kept in the registration_tickets table, so a client can poll
+# any process for them.
+# In "auto" mode the opening time is read from scheduled_games.registration_opened_at
+# at most every REGISTRATION_SURGE_POLL_SECONDS, so every process enters the
+# surge window, not only the one that handled the toggle.
+REGISTRATION_SURGE_MODE = os.getenv("REGISTRATION_SURGE_MODE", "off")
+REGISTRATION_SURGE_WINDOW_SECONDS = float(os.getenv("REGISTRATION_SURGE_WINDOW_SECONDS", "120"))
+REGISTRATION_QUEUE_SIZE = int(os.getenv("REGISTRATION_QUEUE_SIZE", "2000"))
+REGISTRATION_WORKERS = int(os.getenv("REGISTRATION_WORKERS", "4"))
+REGISTRATION_RATE_PER_SECOND = float(os.getenv("REGISTRATION_RATE_PER_SECOND", "50"))
+REGISTRATION_TICKET_TTL_SECONDS = int(os.getenv("REGISTRATION_TICKET_TTL_SECONDS", "3600"))
+REGISTRATION_SURGE_POLL_SECONDS = float(os.getenv("REGISTRATION_SURGE_POLL_SECONDS", "2"))
+
+if REGISTRATION_SURGE_MODE not in ("off", "auto", "always"):
+    raise ValueError("REGISTRATION_SURGE_MODE must be 'off', 'auto' or 'always'")
+
+registration_queue = asyncio.Queue(maxsize=REGISTRATION_QUEUE_SIZE)
+# "until" is wall-clock time, since it is derived from a shared database column
+registration_surge = {"until": None, "checked_at": 0.0, "pruned_at": 0.0, "workers": []}
+
+async def registration_surge_active():
+    if not registration_surge["workers"]:
+        return False
+    if REGISTRATION_SURGE_MODE == "always":
+        return True
+    
+    loop = asyncio.get_running_loop()
+    now = datetime.now(timezone.utc)
+    if loop.time() - registration_surge["checked_at"] >= REGISTRATION_SURGE_POLL_SECONDS:
+        # Set first so concurrent requests don't all poll
+        registration_surge["checked_at"] = loop.time()
+        try:
+            response = await run_query(supabase.table("scheduled_games").select("registration_opened_at").gt(
+                "registration_opened_at", (now - timedelta(seconds=REGISTRATION_SURGE_WINDOW_SECONDS)).isoformat()
+            ).order("registration_opened_at", desc=True).limit(1))
+            if response.data:
+                opened_at = datetime.fromisoformat(response.data[0]["registration_opened_at"])
+                registration_surge["until"] = opened_at + timedelta(seconds=REGISTRATION_SURGE_WINDOW_SECONDS)
+        except Exception:
+            # Keep the last known window; registrations must not fail on this check
+            pass
+    return registration_surge["until"] is not None and now < registration_surge["until"]
+
+def start_registration_surge(opened_at: datetime):
+    if REGISTRATION_SURGE_MODE == "auto":
+        registration_surge["until"] = opened_at + timedelta(seconds=REGISTRATION_SURGE_WINDOW_SECONDS)
+
+async def prune_registration_tickets():
+    """Delete tickets older than REGISTRATION_TICKET_TTL_SECONDS, at most once a minute"""
+    loop = asyncio.get_running_loop()
+    if loop.time() - registration_surge["pruned_at"] < 60:
+        return
+    registration_surge["pruned_at"] = loop.time()
+    expiry = datetime.now(timezone.utc) - timedelta(seconds=REGISTRATION_TICKET_TTL_SECONDS)
+    await run_query(supabase.table("registration_tickets").delete().lt("updated_at", expiry.isoformat()))
+
+async def enqueue_registration(kind: str, registration):
+    """Queue a registration and answer at once with its ticket
+    
+    Tickets live in the registration_tickets table, so any process can
+    report the outcome of a registration queued by another.
+    """
+    if registration_queue.full():
+        raise HTTPException(
+            status_code=503,
+            detail="Registration queue is full, please try again shortly",
+            headers={"Retry-After": "5"}
+        )
+    
+    await prune_registration_tickets()
+    ticket_id = secrets.token_urlsafe(12)
+    await run_query(supabase.table("registration_tickets").insert({
+        "ticket_id": ticket_id,
+        "kind": kind,
+        "status": "queued"
+    }))
+    registration_queue.put_nowait((ticket_id, kind, registration))
+    return FastJSONResponse({"ticket_id": ticket_id, "status": "queued"}, status_code=202)
+
+async def registration_worker():
+    loop = asyncio.get_running_loop()
+    # Each worker takes its share of the overall admission rate
+    interval = REGISTRATION_WORKERS / REGISTRATION_RATE_PER_SECOND if REGISTRATION_RATE_PER_SECOND > 0 else 0
+    while True:
+        ticket_id, kind, registration = await registration_queue.get()
+        started = loop.time()
+        outcome = {}
+        try:
+            admit = admit_team if kind == "team" else admit_individual
+            outcome["registration"] = await admit(registration)
+            outcome["status"] = "registered"
+        except HTTPException as e:
+            outcome["status"] = "rejected"
+            outcome["error"] = e.detail
+        except Exception as e:
+            outcome["status"] = "failed"
+            outcome["error"] = str(e)
+        
+        outcome["updated_at"] = datetime.now(timezone.utc).isoformat()
+        for attempt in range(3):
+            try:
+                await run_query(supabase.table("registration_tickets").update(outcome).eq("ticket_id", ticket_id))
+                break
+            except Exception:
+                # The registration itself stands; only its ticket is behind
+                await asyncio.sleep(attempt + 1)
+        registration_queue.task_done()
+        await asyncio.sleep(max(0, interval - (loop.time() - started)))
+
+@app.on_event("startup")
+async def start_registration_workers():
+    if REGISTRATION_SURGE_MODE != "off":
+        registration_surge["workers"] = [
+            asyncio.create_task(registration_worker()) for _ in range(REGISTRATION_WORKERS)
+        ]
+
+@app.on_event("shutdown")
+async def stop_registration_workers():
+    # Stop taking new tickets and let the workers finish what is queued
+    workers = registration_surge["workers"]
+    registration_surge["workers"] = []
+    if workers:
+        await registration_queue.join()
+        for worker in workers:
+            worker.cancel()
+
+@app.get("/registration-tickets/{ticket_id}")
+async def get_registration_ticket(ticket_id: str):
+    """Get the outcome of a queued registration"""
+    try:
+        response = await run_query(supabase.table("registration_tickets").select(
+            "ticket_id, status, registration, error"
+        ).eq("ticket_id", ticket_id))
+        
+        if not response.data:
+            raise HTTPException(status_code=404, detail="Ticket not found")
+        
+        ticket = {key: value for key, value in response.data[0].items() if value is not None}
+        if ticket["status"] == "queued":
+            # Only this process's queue is known here
+            ticket["queue_length"] = registration_queue.qsize()
+        return ticket
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 # Health check
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
 
+async def load_scoreboard():
+    """Load active games, their states and registrations with a fixed number of queries"""
+    scoreboard = {"games": [], "states": {}, "teams": {}, "players": {}}
+    
+    games_response = await run_query(supabase.table("scheduled_games").select(
+        "*, games(*)"
+    ).eq("is_active", True))
+    
+    scoreboard["games"] = games_response.data
+    if not games_response.data:
+        return scoreboard
+    
+    # One query for every game state
+    states_response = await run_query(supabase.table("active_game_states").select("*").in_(
+        "scheduled_game_id", [game["id"] for game in games_response.data]
+    ))
+    scoreboard["states"] = {state["scheduled_game_id"]: state for state in states_response.data}
+    
+    # One query per registration table
+    team_game_ids = [g["id"] for g in games_response.data if g["game_type"] == "team"]
+    individual_game_ids = [g["id"] for g in games_response.data if g["game_type"] != "team"]
+    
+    if team_game_ids:
+        teams_response = await run_query(supabase.table("team_registrations").select("*").in_(
+            "scheduled_game_id", team_game_ids
+        ))
+        for team in teams_response.data:
+            scoreboard["teams"].setdefault(team["scheduled_game_id"], []).append(team)
+    
+    if individual_game_ids:
+        players_response = await run_query(supabase.table("individual_registrations").select("*").in_(
+            "scheduled_game_id", individual_game_ids
+        ))
+        for player in players_response.data:
+            scoreboard["players"].setdefault(player["scheduled_game_id"], []).append(player)
+    
+    return scoreboard
+
+def initial_participants(game, scoreboard):
+    """Build the starting participant list of a game that has no state yet"""
+    if game["game_type"] == "team":
+        return [
+            {"name": team["team_name"], "score": 0}
+            for team in scoreboard["teams"].get(game["id"], [])
+        ]
+    return [
+        {"name": player["player_name"], "time": None}
+        for player in scoreboard["players"].get(game["id"], [])
+    ]
+
+# ==================== SCOREBOARD CACHE ====================
+
+# Public scoreboard polls are served from memory. Score and time updates
+# write the new state through, other mutations drop the cache, and the TTL
+# catches writes made outside the API.
+SCOREBOARD_TTL_SECONDS = float(os.getenv("SCOREBOARD_TTL_SECONDS", "10"))
+scoreboard_cache = {"data": None, "loaded_at": 0.0, "generation": 0}
+scoreboard_lock = asyncio.Lock()
+
+async def get_scoreboard():
+    """Return the cached scoreboard, reloading it when missing or stale"""
+    loop = asyncio.get_running_loop()
+    cached = scoreboard_cache["data"]
+    if cached is not None and loop.time() - scoreboard_cache["loaded_at"] < SCOREBOARD_TTL_SECONDS:
+        return cached
+    
+    async with scoreboard_lock:
+        # Another request may have reloaded it while we waited
+        cached = scoreboard_cache["data"]
+        if cached is not None and loop.time() - scoreboard_cache["loaded_at"] < SCOREBOARD_TTL_SECONDS:
+            return cached
+        
+        generation = scoreboard_cache["generation"]
+        scoreboard = await load_scoreboard()
+        
+        # Don't store a snapshot that a concurrent write has already outdated
+        if generation == scoreboard_cache["generation"]:
+            scoreboard_cache["data"] = scoreboard
+            scoreboard_cache["loaded_at"] = loop.time()
+        return scoreboard
+
+def invalidate_scoreboard():
+    """Drop the cached scoreboard so the next poll reloads it
+    
+    Connected spectators get a fresh snapshot shortly after.
+    """
+    scoreboard_cache["generation"] += 1
+    scoreboard_cache["data"] = None
+    schedule_live_snapshot()
+
+def cache_game_state(state):
+    """Write an updated game state through to the cached scoreboard"""
+    scoreboard_cache["generation"] += 1
+    cached = scoreboard_cache["data"]
+    if cached is None:
+        return
+    
+    if state.get("status") != "playing" or not any(
+        game["id"] == state["scheduled_game_id"] for game in cached["games"]
+    ):
+        invalidate_scoreboard()
+        return
+    
+    # Swap in a new states dict so readers never see a half-updated one
+    cached["states"] = {**cached["states"], state["scheduled_game_id"]: state}
+    cached.pop("live_response", None)
+
+# ==================== LIVE SCORE STREAM ====================
+
+# Every connected spectator gets a queue. Events are serialized once in
+# publish_live_event and the same message is handed to every queue. Writes
+# that drop the scoreboard publish a snapshot LIVE_SNAPSHOT_DELAY_SECONDS
+# later, so a burst of writes sends one. Events only reach the spectators of
+# the process that handled the write; clients also poll /live-games?since=
+# now and then to pick up the rest.
+LIVE_STREAM_QUEUE_SIZE = int(os.getenv("LIVE_STREAM_QUEUE_SIZE", "100"))
+LIVE_STREAM_KEEPALIVE_SECONDS = 15
+LIVE_SNAPSHOT_DELAY_SECONDS = float(os.getenv("LIVE_SNAPSHOT_DELAY_SECONDS", "0.5"))
+live_subscribers = set()
+live_snapshot = {"task": None}
+
+def format_sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+def publish_live_event(event, data):
+    """Fan a live score event out to every connected stream"""
+    if not live_subscribers:
+        return
+    
+    message = format_sse(event, data)
+    for queue in list(live_subscribers):
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Drop clients that stopped reading; they reconnect and get a new snapshot
+            live_subscribers.discard(queue)
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(None)
+
+async def publish_live_snapshot():
+    """Push a full snapshot, used when the set of live games changes"""
+    if live_subscribers:
+        publish_live_event("snapshot", build_live_games(await get_scoreboard()))
+
+def schedule_live_snapshot():
+    """Publish a snapshot soon, unless one is already waiting to go out"""
+    if not live_subscribers or live_snapshot["task"] is not None:
+        return
+    live_snapshot["task"] = asyncio.get_running_loop().create_task(publish_delayed_snapshot())
+
+async def publish_delayed_snapshot():
+    await asyncio.sleep(LIVE_SNAPSHOT_DELAY_SECONDS)
+    # Writes made while this snapshot loads schedule the next one
+    live_snapshot["task"] = None
+    try:
+        await publish_live_snapshot()
+    except Exception:
+        # Clients catch up with their next poll
+        pass
+
+async def live_event_stream(request: Request):
+    queue = asyncio.Queue(maxsize=LIVE_STREAM_QUEUE_SIZE)
+    # Subscribe before taking the snapshot so no update falls in between
+    live_subscribers.add(queue)
+    try:
+        snapshot = build_live_games(await get_scoreboard())
+        yield format_sse("snapshot", snapshot)
+        
+        while not await request.is_disconnected():
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout=LIVE_STREAM_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            
+            if message is None:
+                break
+            yield message
+    finally:
+        live_subscribers.discard(queue)
+
 @app.get("/active-games/list")
 async def get_active_games_with_state():
     """Get all active games with their current state"""
     try:
-        # Get active scheduled games
-        games_response = supabase.table("scheduled_games").select(
-            "*, games(*)"
-        ).eq("is_active", True).execute()
-        
-        if not games_response.data:
-            return []
+        scoreboard = await get_scoreboard()
+        states = scoreboard["states"]
         
         result = []
-        for game in games_response.data:
-            # Try to get existing state
-            state_response = supabase.table("active_game_states").select("*").eq(
-                "scheduled_game_id", game["id"]
-            ).execute()
-            
+        for game in scoreboard["games"]:
             game_data = {
                 "id": game["id"],
                 "game": game["games"],
@@ -737,137 +1796,264 @@ async def get_active_games_with_state():
             }
             
             # If state exists, use it
-            if state_response.data and len(state_response.data) > 0:
-                game_data["current_scores"] = state_response.data[0]["current_scores"]
-                game_data["status"] = state_response.data[0]["status"]
+            state = states.get(game["id"])
+            if state:
+                game_data["current_scores"] = state["current_scores"]
+                game_data["status"] = state["status"]
             else:
-                # Initialize state based on game type
-                if game["game_type"] == "team":
-                    # Get team registrations
-                    teams_response = supabase.table("team_registrations").select("*").eq(
-                        "scheduled_game_id", game["id"]
-                    ).execute()
-                    
-                    game_data["current_scores"] = {
-                        "participants": [
-                            {"name": team["team_name"], "score": 0}
-                            for team in teams_response.data
-                        ]
-                    }
-                else:
-                    # Get individual registrations
-                    players_response = supabase.table("individual_registrations").select("*").eq(
-                        "scheduled_game_id", game["id"]
-                    ).execute()
-                    
-                    game_data["current_scores"] = {
-                        "participants": [
-                            {"name": player["player_name"], "time": None}
-                            for player in players_response.data
-                        ]
-                    }
+                # Initialize state from registrations
+                game_data["current_scores"] = {
+                    "participants": initial_participants(game, scoreboard)
+                }
             
             result.append(game_data)
         
-        return result
+        return json_response("live-games", result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def scored_state(state, participant_index: int):
+    """Return the state increment_participant_score sent back, or 400 if the index was out of range"""
+    if not 0 <= participant_index < len(state["current_scores"].get("participants", [])):
+        raise HTTPException(status_code=400, detail="Invalid participant index")
+    return state
+
+async def apply_score_change(scheduled_game_id: int, participant_index: int, score_change: int):
+    """Atomically add score_change to one participant, creating the game state if needed"""
+    params = {
+        "p_scheduled_game_id": scheduled_game_id,
+        "p_participant_index": participant_index,
+        "p_score_change": score_change
+    }
+    
+    response = await run_query(supabase.rpc("increment_participant_score", params))
+    if response.data:
+        return scored_state(response.data[0], participant_index)
+    
+    # No state yet: create it from the registered teams
+    game_response = await run_query(supabase.table("scheduled_games").select("id").eq(
+        "id", scheduled_game_id
+    ))
+    
+    if not game_response.data:
+        raise HTTPException(status_code=404, detail="Game not found")
+    
+    teams_response = await run_query(supabase.table("team_registrations").select("team_name").eq(
+        "scheduled_game_id", scheduled_game_id
+    ))
+    
+    # Another scorer may have created the state first, so ignore duplicates
+    await run_query(supabase.table("active_game_states").upsert({
+        "scheduled_game_id": scheduled_game_id,
+        "current_scores": {
+            "participants": [
+                {"name": team["team_name"], "score": 0}
+                for team in teams_response.data
+            ]
+        },
+        "status": "playing"
+    }, on_conflict="scheduled_game_id", ignore_duplicates=True))
+    
+    response = await run_query(supabase.rpc("increment_participant_score", params))
+    if not response.data:
+        raise HTTPException(status_code=400, detail="Invalid participant index")
+    
+    return scored_state(response.data[0], participant_index)
+
+# ==================== SCORE TAP BUFFER ====================
+
+# Score taps are summed per (scheduled_game_id, participant_index) and
+# written once per flush interval. Each tap is clamped at zero as it is
+# merged, so 0, -1, +1 still ends at 1 as it did tap by tap. Set
+# SCORE_FLUSH_INTERVAL_MS=0 to write every tap straight through.
+SCORE_FLUSH_INTERVAL_MS = int(os.getenv("SCORE_FLUSH_INTERVAL_MS", "250"))
+pending_score_changes = {}
+flushing_score_changes = {}
+score_flush_lock = asyncio.Lock()
+score_flusher = {"task": None, "stop": None}
+
+def preview_game_state(state):
+    """Return a copy of a cached game state with the buffered score changes applied"""
+    participants = [dict(p) for p in state["current_scores"].get("participants", [])]
+    for changes in (flushing_score_changes, pending_score_changes):
+        for (game_id, index), change in changes.items():
+            if game_id == state["scheduled_game_id"] and index < len(participants):
+                participants[index]["score"] = max(participants[index].get("score", 0) + change, 0)
+    
+    return {**state, "current_scores": {**state["current_scores"], "participants": participants}}
+
+async def flush_score_changes():
+    """Write every buffered score change to the database"""
+    async with score_flush_lock:
+        if not pending_score_changes:
+            return
+        
+        # Changes being written stay visible to preview_game_state until the
+        # cached scoreboard holds the new states
+        flushing_score_changes.update(pending_score_changes)
+        pending_score_changes.clear()
+        
+        flushed_states = {}
+        failed_changes = {}
+        for (game_id, index), change in flushing_score_changes.items():
+            if change == 0:
+                continue
+            try:
+                flushed_states[game_id] = await apply_score_change(game_id, index, change)
+            except HTTPException:
+                # The game or participant no longer exists
+                continue
+            except Exception:
+                failed_changes[(game_id, index)] = change
+        
+        # Keep failed changes for the next flush
+        for key, change in failed_changes.items():
+            pending_score_changes[key] = pending_score_changes.get(key, 0) + change
+        flushing_score_changes.clear()
+        
+        for game_id, state in flushed_states.items():
+            cache_game_state(state)
+            publish_live_event("scores", {
+                "id": game_id,
+                "participants": preview_game_state(state)["current_scores"].get("participants", [])
+            })
+
+async def score_flush_loop():
+    stop = score_flusher["stop"]
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=SCORE_FLUSH_INTERVAL_MS / 1000)
+        except asyncio.TimeoutError:
+            pass
+        await flush_score_changes()
+
+@app.on_event("startup")
+async def start_score_flusher():
+    if SCORE_FLUSH_INTERVAL_MS > 0:
+        score_flusher["stop"] = asyncio.Event()
+        score_flusher["task"] = asyncio.create_task(score_flush_loop())
+
+@app.on_event("shutdown")
+async def shutdown_background_work():
+    # Flush every buffered tap before the database pool goes away
+    if score_flusher["task"]:
+        score_flusher["stop"].set()
+        await score_flusher["task"]
+    await flush_score_changes()
+    db_executor.shutdown(wait=True)
+
 @app.post("/active-games/{scheduled_game_id}/update-score")
 async def update_game_score(scheduled_game_id: int, update: ScoreUpdate):
     """Update score for a team game"""
     try:
-        # Get current state
-        state_response = supabase.table("active_game_states").select("*").eq(
-            "scheduled_game_id", scheduled_game_id
-        ).execute()
-        
-        if state_response.data and len(state_response.data) > 0:
-            # Update existing state
-            current_scores = state_response.data[0]["current_scores"]
-            current_scores["participants"][update.participant_index]["score"] += update.score_change
-            
-            # Ensure score doesn't go below 0
-            if current_scores["participants"][update.participant_index]["score"] < 0:
-                current_scores["participants"][update.participant_index]["score"] = 0
-            
-            response = supabase.table("active_game_states").update({
-                "current_scores": current_scores,
-                "updated_at": datetime.now().isoformat()
-            }).eq("id", state_response.data[0]["id"]).execute()
-            
-            return response.data[0]
-        else:
-            # Create new state
-            game_response = supabase.table("scheduled_games").select("*").eq(
-                "id", scheduled_game_id
-            ).execute()
+        if score_flusher["task"]:
+            scoreboard = await get_scoreboard()
+            state = scoreboard["states"].get(scheduled_game_id)
+            participants = state["current_scores"].get("participants", []) if state else []
             
-            if not game_response.data:
-                raise HTTPException(status_code=404, detail="Game not found")
-            
-            # Get teams
-            teams_response = supabase.table("team_registrations").select("*").eq(
-                "scheduled_game_id", scheduled_game_id
-            ).execute()
-            
-            current_scores = {
-                "participants": [
-                    {"name": team["team_name"], "score": 0}
-                    for team in teams_response.data
-                ]
-            }
-            
-            # Apply the score change
-            current_scores["participants"][update.participant_index]["score"] += update.score_change
-            if current_scores["participants"][update.participant_index]["score"] < 0:
-                current_scores["participants"][update.participant_index]["score"] = 0
-            
-            response = supabase.table("active_game_states").insert({
-                "scheduled_game_id": scheduled_game_id,
-                "current_scores": current_scores,
-                "status": "playing"
-            }).execute()
-            
-            return response.data[0]
+            # Buffer the tap and answer from memory when the game state is known
+            if state and state["status"] == "playing" and 0 <= update.participant_index < len(participants):
+                key = (scheduled_game_id, update.participant_index)
+                current = preview_game_state(state)["current_scores"]["participants"][update.participant_index].get("score", 0)
+                change = max(current + update.score_change, 0) - current
+                pending_score_changes[key] = pending_score_changes.get(key, 0) + change
+                return preview_game_state(state)
+        
+        state = await apply_score_change(
+            scheduled_game_id, update.participant_index, update.score_change
+        )
+        
+        cache_game_state(state)
+        publish_live_event("scores", {
+            "id": scheduled_game_id,
+            "participants": state["current_scores"].get("participants", [])
+        })
+        return state
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def parse_time_ms(value) -> Optional[int]:
+    """Parse a race time like "12.5", "12.5s", "1:05.3" or "1:02:03" into milliseconds"""
+    text = str(value).strip().lower()
+    for suffix in ("secs", "sec", "s"):
+        if text.endswith(suffix):
+            text = text[:-len(suffix)].strip()
+            break
+    
+    parts = text.split(":")
+    if len(parts) > 3 or not all(parts):
+        return None
+    try:
+        whole = [int(part) for part in parts[:-1]]
+        seconds = float(parts[-1])
+    except ValueError:
+        return None
+    
+    # Fields after the first must stay below 60; nan and inf fail these checks too
+    if any(part < 0 for part in whole) or not 0 <= seconds < (60 if whole else float("inf")):
+        return None
+    if any(part >= 60 for part in whole[1:]):
+        return None
+    
+    total = 0
+    for part in whole:
+        total = total * 60 + part
+    return round((total * 60 + seconds) * 1000)
+
+def time_ms(participant) -> Optional[int]:
+    """Canonical time of a participant; states written before time_ms existed are parsed here"""
+    if "time_ms" in participant:
+        return participant["time_ms"]
+    if participant.get("time"):
+        return parse_time_ms(participant["time"])
+    return None
+
 @app.post("/active-games/{scheduled_game_id}/update-time")
 async def update_game_time(scheduled_game_id: int, update: TimeUpdate):
     """Update time for an individual game"""
     try:
+        # Parsed once here so rankings sort plain integers. The scorer UI posts
+        # every keystroke, so partial or empty input ("1:", "") is stored as
+        # typed with time_ms None and simply left out of the ranking
+        update_ms = parse_time_ms(update.time) if update.time else None
+        
         # Get current state
-        state_response = supabase.table("active_game_states").select("*").eq(
+        state_response = await run_query(supabase.table("active_game_states").select("*").eq(
             "scheduled_game_id", scheduled_game_id
-        ).execute()
+        ))
         
         if state_response.data and len(state_response.data) > 0:
             # Update existing state
             current_scores = state_response.data[0]["current_scores"]
             current_scores["participants"][update.participant_index]["time"] = update.time
+            current_scores["participants"][update.participant_index]["time_ms"] = update_ms
             
-            response = supabase.table("active_game_states").update({
+            response = await run_query(supabase.table("active_game_states").update({
                 "current_scores": current_scores,
                 "updated_at": datetime.now().isoformat()
-            }).eq("id", state_response.data[0]["id"]).execute()
+            }).eq("id", state_response.data[0]["id"]))
             
+            cache_game_state(response.data[0])
+            publish_live_event("scores", {
+                "id": scheduled_game_id,
+                "participants": response.data[0]["current_scores"].get("participants", [])
+            })
             return response.data[0]
         else:
             # Create new state
-            game_response = supabase.table("scheduled_games").select("*").eq(
+            game_response = await run_query(supabase.table("scheduled_games").select("*").eq(
                 "id", scheduled_game_id
-            ).execute()
+            ))
             
             if not game_response.data:
                 raise HTTPException(status_code=404, detail="Game not found")
             
             # Get players
-            players_response = supabase.table("individual_registrations").select("*").eq(
+            players_response = await run_query(supabase.table("individual_registrations").select("*").eq(
                 "scheduled_game_id", scheduled_game_id
-            ).execute()
+            ))
             
             current_scores = {
                 "participants": [
@@ -878,13 +2064,19 @@ async def update_game_time(scheduled_game_id: int, update: TimeUpdate):
             
             # Apply the time update
             current_scores["participants"][update.participant_index]["time"] = update.time
+            current_scores["participants"][update.participant_index]["time_ms"] = update_ms
             
-            response = supabase.table("active_game_states").insert({
+            response = await run_query(supabase.table("active_game_states").insert({
                 "scheduled_game_id": scheduled_game_id,
                 "current_scores": current_scores,
                 "status": "playing"
-            }).execute()
+            }))
             
+            cache_game_state(response.data[0])
+            publish_live_event("scores", {
+                "id": scheduled_game_id,
+                "participants": response.data[0]["current_scores"].get("participants", [])
+            })
             return response.data[0]
     except HTTPException:
         raise
@@ -895,10 +2087,13 @@ async def update_game_time(scheduled_game_id: int, update: TimeUpdate):
 async def declare_winner(scheduled_game_id: int, result: GameResult):
     """Declare winner and mark game as completed"""
     try:
+        # Buffered taps must land before the final scores are frozen
+        await flush_score_changes()
+        
         # Get current state
-        state_response = supabase.table("active_game_states").select("*").eq(
+        state_response = await run_query(supabase.table("active_game_states").select("*").eq(
             "scheduled_game_id", scheduled_game_id
-        ).execute()
+        ))
         
         winner_data = {
             "name": result.winner_name,
@@ -909,26 +2104,32 @@ async def declare_winner(scheduled_game_id: int, result: GameResult):
         
         if state_response.data and len(state_response.data) > 0:
             # Update existing state
-            response = supabase.table("active_game_states").update({
+            response = await run_query(supabase.table("active_game_states").update({
                 "status": "completed",
                 "winner_data": winner_data,
                 "updated_at": datetime.now().isoformat()
-            }).eq("id", state_response.data[0]["id"]).execute()
+            }).eq("id", state_response.data[0]["id"]))
         else:
             # Create new completed state
-            response = supabase.table("active_game_states").insert({
+            response = await run_query(supabase.table("active_game_states").insert({
                 "scheduled_game_id": scheduled_game_id,
                 "current_scores": {"participants": []},
                 "status": "completed",
                 "winner_data": winner_data
-            }).execute()
+            }))
+        
+        # Deactivate the game; a league match also hands its winner to the next match
+        next_match = await run_query(supabase.rpc("complete_scheduled_game", {
+            "p_scheduled_game_id": scheduled_game_id,
+            "p_winner_name": result.winner_name
+        }))
+        invalidate_scoreboard()
         
-        # Deactivate the game
-        supabase.table("scheduled_games").update({
-            "is_active": False
-        }).eq("id", scheduled_game_id).execute()
+        # Rank the final standings once so the results pages are plain reads
+        await materialize_result(scheduled_game_id)
+        publish_live_event("winner", {"id": scheduled_game_id, "winner": winner_data})
         
-        return {"message": "Winner declared successfully", "winner": winner_data}
+        return {"message": "Winner declared successfully", "winner": winner_data, "next_match": next_match.data}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -936,9 +2137,9 @@ async def declare_winner(scheduled_game_id: int, result: GameResult):
 async def get_game_state(scheduled_game_id: int):
     """Get current state of a specific game"""
     try:
-        state_response = supabase.table("active_game_states").select("*").eq(
+        state_response = await run_query(supabase.table("active_game_states").select("*").eq(
             "scheduled_game_id", scheduled_game_id
-        ).execute()
+        ))
         
         if not state_response.data:
             raise HTTPException(status_code=404, detail="Game state not found")
@@ -949,77 +2150,129 @@ async def get_game_state(scheduled_game_id: int):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
+# ==================== RESULTS ====================
+
+def format_result(result, full_standings=False):
+    """Rank the participants of a completed game state for the results pages"""
+    game_data = result["scheduled_games"]
+    
+    formatted_result = {
+        "id": result["id"],
+        "scheduled_game_id": result["scheduled_game_id"],
+        "game": game_data["games"],
+        "date": game_data["date"],
+        "venue": game_data["venue"],
+        "game_type": game_data["game_type"],
+        "winner_data": result["winner_data"],
+        "current_scores": result["current_scores"],
+        "completed_at": result["updated_at"]
+    }
+    
+    participants = result["current_scores"].get("participants", [])
+    
+    # Format based on game type
+    if game_data["game_type"] == "team":
+        # For team events, show winner and runner-up
+        sorted_participants = sorted(participants, key=lambda x: x.get("score", 0), reverse=True)
+        
+        formatted_result["winner"] = {
+            "name": sorted_participants[0]["name"] if len(sorted_participants) > 0 else "N/A",
+            "score": sorted_participants[0].get("score", 0) if len(sorted_participants) > 0 else 0
+        }
+        
+        formatted_result["runner_up"] = {
+            "name": sorted_participants[1]["name"] if len(sorted_participants) > 1 else "N/A",
+            "score": sorted_participants[1].get("score", 0) if len(sorted_participants) > 1 else 0
+        }
+        
+        if full_standings:
+            # Add all participants ranking, teams on the same score share a rank
+            formatted_result["all_participants"] = [
+                {"name": p["name"], "score": p.get("score", 0), "rank": rank}
+                for rank, p in ranked(participants, key=lambda x: -x.get("score", 0))
+            ]
+    else:
+        # For individual events, show top 3 with medals
+        timed_participants = [p for p in participants if time_ms(p) is not None]
+        standings = ranked(timed_participants, key=time_ms, limit=None if full_standings else len(MEDALS))
+        
+        formatted_result["results"] = [
+            {
+                "position": position,
+                "name": participant["name"],
+                "time": participant.get("time"),
+                "medal": medal(position)
+            }
+            for position, participant in standings
+        ]
+    
+    return formatted_result
+
+RESULT_FIELDS = {
+    field: f"{field}:summary->{field}"
+    for field in [
+        "id", "scheduled_game_id", "game", "date", "venue", "game_type", "winner_data",
+        "current_scores", "completed_at", "winner", "runner_up", "results"
+    ]
+}
+
+def build_result_row(result):
+    """Build the game_results row for a completed game state"""
+    return {
+        "scheduled_game_id": result["scheduled_game_id"],
+        "category": result["scheduled_games"]["games"]["category"],
+        "summary": format_result(result),
+        "details": format_result(result, full_standings=True),
+        "completed_at": result["updated_at"]
+    }
+
+async def materialize_result(scheduled_game_id: int):
+    """Store the ranked result of a completed game in game_results"""
+    state_response = await run_query(supabase.table("active_game_states").select(
+        "*, scheduled_games(*, games(*))"
+    ).eq("scheduled_game_id", scheduled_game_id).eq("status", "completed"))
+    
+    if not state_response.data:
+        return None
+    
+    response = await run_query(supabase.table("game_results").upsert(
+        build_result_row(state_response.data[0]), on_conflict="scheduled_game_id"
+    ))
+    return response.data[0]
+
 @app.get("/results")
-async def get_all_results():
+async def get_all_results(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
+):
     """Get all completed games with results"""
     try:
-        # Get all completed game states
-        results_response = supabase.table("active_game_states").select(
-            "*, scheduled_games(*, games(*))"
-        ).eq("status", "completed").execute()
+        # Projected fields are read straight out of the stored summary
+        query = supabase.table("game_results").select(
+            "result_id:id, result_completed_at:completed_at, "
+            + select_fields(fields, RESULT_FIELDS, [], "summary")
+        )
+        if limit:
+            query = paginate(query, ["completed_at", "id"], limit, cursor, desc=True)
+        else:
+            query = query.order("completed_at", desc=True)
         
-        if not results_response.data:
-            return []
+        result = await run_query(query)
         
-        formatted_results = []
-        for result in results_response.data:
-            game_data = result["scheduled_games"]
-            
-            formatted_result = {
-                "id": result["id"],
-                "scheduled_game_id": result["scheduled_game_id"],
-                "game": game_data["games"],
-                "date": game_data["date"],
-                "venue": game_data["venue"],
-                "game_type": game_data["game_type"],
-                "winner_data": result["winner_data"],
-                "current_scores": result["current_scores"],
-                "completed_at": result["updated_at"]
-            }
-            
-            # Format based on game type
-            if game_data["game_type"] == "team":
-                # For team events, show winner and runner-up
-                participants = result["current_scores"].get("participants", [])
-                sorted_participants = sorted(participants, key=lambda x: x.get("score", 0), reverse=True)
-                
-                formatted_result["winner"] = {
-                    "name": sorted_participants[0]["name"] if len(sorted_participants) > 0 else "N/A",
-                    "score": sorted_participants[0].get("score", 0) if len(sorted_participants) > 0 else 0
-                }
-                
-                formatted_result["runner_up"] = {
-                    "name": sorted_participants[1]["name"] if len(sorted_participants) > 1 else "N/A",
-                    "score": sorted_participants[1].get("score", 0) if len(sorted_participants) > 1 else 0
-                }
-            else:
-                # For individual events, show top 3 with medals
-                participants = result["current_scores"].get("participants", [])
-                # Filter participants with times and sort by time
-                timed_participants = [p for p in participants if p.get("time")]
-                sorted_participants = sorted(
-                    timed_participants, 
-                    key=lambda x: float(str(x.get("time", "999")).replace("s", ""))
-                )
-                
-                results_list = []
-                medals = ["gold", "silver", "bronze"]
-                for idx, participant in enumerate(sorted_participants[:3]):
-                    results_list.append({
-                        "position": idx + 1,
-                        "name": participant["name"],
-                        "time": participant.get("time"),
-                        "medal": medals[idx] if idx < 3 else None
-                    })
-                
-                formatted_result["results"] = results_list
-            
-            formatted_results.append(formatted_result)
-        
-        # Sort by completion date, most recent first
-        formatted_results.sort(key=lambda x: x["completed_at"], reverse=True)
+        page_cursor = next_cursor(result.data, ["result_completed_at", "result_id"], limit)
+        if page_cursor:
+            response.headers["X-Next-Cursor"] = page_cursor
         
-        return formatted_results
+        if not fields:
+            return json_response("results", [row["summary"] for row in result.data], response)
+        return json_response("results", [
+            {key: value for key, value in row.items() if key not in ("result_id", "result_completed_at")}
+            for row in result.data
+        ], response)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1027,143 +2280,36 @@ async def get_all_results():
 async def get_results_by_category(category: str):
     """Get completed games filtered by category"""
     try:
-        # Get all completed game states with game info
-        results_response = supabase.table("active_game_states").select(
-            "*, scheduled_games(*, games(*))"
-        ).eq("status", "completed").execute()
-        
-        if not results_response.data:
-            return []
+        query = supabase.table("game_results").select("summary")
         
         # Filter by category if not 'all'
-        filtered_results = []
-        for result in results_response.data:
-            game_category = result["scheduled_games"]["games"]["category"]
-            if category == "all" or game_category == category:
-                game_data = result["scheduled_games"]
-                
-                formatted_result = {
-                    "id": result["id"],
-                    "scheduled_game_id": result["scheduled_game_id"],
-                    "game": game_data["games"],
-                    "date": game_data["date"],
-                    "venue": game_data["venue"],
-                    "game_type": game_data["game_type"],
-                    "winner_data": result["winner_data"],
-                    "current_scores": result["current_scores"],
-                    "completed_at": result["updated_at"]
-                }
-                
-                # Format based on game type
-                if game_data["game_type"] == "team":
-                    participants = result["current_scores"].get("participants", [])
-                    sorted_participants = sorted(participants, key=lambda x: x.get("score", 0), reverse=True)
-                    
-                    formatted_result["winner"] = {
-                        "name": sorted_participants[0]["name"] if len(sorted_participants) > 0 else "N/A",
-                        "score": sorted_participants[0].get("score", 0) if len(sorted_participants) > 0 else 0
-                    }
-                    
-                    formatted_result["runner_up"] = {
-                        "name": sorted_participants[1]["name"] if len(sorted_participants) > 1 else "N/A",
-                        "score": sorted_participants[1].get("score", 0) if len(sorted_participants) > 1 else 0
-                    }
-                else:
-                    participants = result["current_scores"].get("participants", [])
-                    timed_participants = [p for p in participants if p.get("time")]
-                    sorted_participants = sorted(
-                        timed_participants, 
-                        key=lambda x: float(str(x.get("time", "999")).replace("s", ""))
-                    )
-                    
-                    results_list = []
-                    medals = ["gold", "silver", "bronze"]
-                    for idx, participant in enumerate(sorted_participants[:3]):
-                        results_list.append({
-                            "position": idx + 1,
-                            "name": participant["name"],
-                            "time": participant.get("time"),
-                            "medal": medals[idx] if idx < 3 else None
-                        })
-                    
-                    formatted_result["results"] = results_list
-                
-                filtered_results.append(formatted_result)
-        
-        # Sort by completion date
-        filtered_results.sort(key=lambda x: x["completed_at"], reverse=True)
+        if category != "all":
+            query = query.eq("category", category)
         
-        return filtered_results
+        response = await run_query(query.order("completed_at", desc=True))
+        return json_response("results", [row["summary"] for row in response.data])
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/results/{scheduled_game_id}")
-async def get_result_by_id(scheduled_game_id: int):
+async def get_result_by_id(scheduled_game_id: int, top: Optional[int] = Query(None, ge=1)):
     """Get result for a specific game"""
     try:
-        result_response = supabase.table("active_game_states").select(
-            "*, scheduled_games(*, games(*))"
-        ).eq("scheduled_game_id", scheduled_game_id).eq("status", "completed").execute()
+        response = await run_query(supabase.table("game_results").select("details").eq(
+            "scheduled_game_id", scheduled_game_id
+        ))
         
-        if not result_response.data:
+        if not response.data:
             raise HTTPException(status_code=404, detail="Result not found")
         
-        result = result_response.data[0]
-        game_data = result["scheduled_games"]
-        
-        formatted_result = {
-            "id": result["id"],
-            "scheduled_game_id": result["scheduled_game_id"],
-            "game": game_data["games"],
-            "date": game_data["date"],
-            "venue": game_data["venue"],
-            "game_type": game_data["game_type"],
-            "winner_data": result["winner_data"],
-            "current_scores": result["current_scores"],
-            "completed_at": result["updated_at"]
-        }
-        
-        # Format based on game type
-        if game_data["game_type"] == "team":
-            participants = result["current_scores"].get("participants", [])
-            sorted_participants = sorted(participants, key=lambda x: x.get("score", 0), reverse=True)
-            
-            formatted_result["winner"] = {
-                "name": sorted_participants[0]["name"] if len(sorted_participants) > 0 else "N/A",
-                "score": sorted_participants[0].get("score", 0) if len(sorted_participants) > 0 else 0
-            }
-            
-            formatted_result["runner_up"] = {
-                "name": sorted_participants[1]["name"] if len(sorted_participants) > 1 else "N/A",
-                "score": sorted_participants[1].get("score", 0) if len(sorted_participants) > 1 else 0
-            }
-            
-            # Add all participants ranking
-            formatted_result["all_participants"] = [
-                {"name": p["name"], "score": p.get("score", 0), "rank": idx + 1}
-                for idx, p in enumerate(sorted_participants)
-            ]
-        else:
-            participants = result["current_scores"].get("participants", [])
-            timed_participants = [p for p in participants if p.get("time")]
-            sorted_participants = sorted(
-                timed_participants, 
-                key=lambda x: float(str(x.get("time", "999")).replace("s", ""))
-            )
-            
-            results_list = []
-            medals = ["gold", "silver", "bronze"]
-            for idx, participant in enumerate(sorted_participants):
-                results_list.append({
-                    "position": idx + 1,
-                    "name": participant["name"],
-                    "time": participant.get("time"),
-                    "medal": medals[idx] if idx < 3 else None
-                })
-            
-            formatted_result["results"] = results_list
-        
-        return formatted_result
+        details = response.data[0]["details"]
+        if top is not None:
+            # Stored positions and ranks are tie-aware, so a tie at the cut keeps everyone in it
+            if "results" in details:
+                details["results"] = [entry for entry in details["results"] if entry["position"] <= top]
+            if "all_participants" in details:
+                details["all_participants"] = [entry for entry in details["all_participants"] if entry["rank"] <= top]
+        return json_response("results", details)
     except HTTPException:
         raise
     except Exception as e:
@@ -1174,9 +2320,9 @@ async def get_results_statistics():
     """Get overall tournament statistics"""
     try:
         # Get all completed games
-        results_response = supabase.table("active_game_states").select(
+        results_response = await run_query(supabase.table("active_game_states").select(
             "*, scheduled_games(*, games(*))"
-        ).eq("status", "completed").execute()
+        ).eq("status", "completed"))
         
         if not results_response.data:
             return {
@@ -1221,86 +2367,91 @@ async def get_results_statistics():
         raise HTTPException(status_code=500, detail=str(e))
     
 
-@app.get("/live-games")
-async def get_live_games():
-    """Get all active games with live scores for public display"""
-    try:
-        # Get active scheduled games
-        games_response = supabase.table("scheduled_games").select(
-            "*, games(*)"
-        ).eq("is_active", True).execute()
+def game_version(game, scoreboard):
+    """Latest change to a live game, from the version columns bumped by the database"""
+    state = scoreboard["states"].get(game["id"])
+    return max(game.get("version") or 0, (state or {}).get("version") or 0)
+
+def build_live_games(scoreboard):
+    """Format the scoreboard for the public live games display"""
+    states = scoreboard["states"]
+    
+    result = []
+    for game in scoreboard["games"]:
+        game_data = {
+            "id": game["id"],
+            "game": game["games"],
+            "startTime": game["scheduled_time"],
+            "date": game["date"],
+            "venue": game["venue"],
+            "gameType": game["game_type"],
+            "status": "playing",
+            "participants": [],
+            "version": game_version(game, scoreboard)
+        }
         
-        if not games_response.data:
-            return []
+        # Get participants with current scores/times
+        state = states.get(game["id"])
+        if state:
+            game_data["participants"] = state["current_scores"].get("participants", [])
+        else:
+            # If no state exists, initialize from registrations
+            game_data["participants"] = initial_participants(game, scoreboard)
         
-        result = []
-        for game in games_response.data:
-            # Get current game state
-            state_response = supabase.table("active_game_states").select("*").eq(
-                "scheduled_game_id", game["id"]
-            ).execute()
-            
-            game_data = {
-                "id": game["id"],
-                "game": game["games"],
-                "startTime": game["scheduled_time"],
-                "date": game["date"],
-                "venue": game["venue"],
-                "gameType": game["game_type"],
-                "status": "playing",
-                "participants": []
-            }
-            
-            # Get participants with current scores/times
-            if state_response.data and len(state_response.data) > 0:
-                current_scores = state_response.data[0]["current_scores"]
-                game_data["participants"] = current_scores.get("participants", [])
-            else:
-                # If no state exists, initialize from registrations
-                if game["game_type"] == "team":
-                    teams_response = supabase.table("team_registrations").select("*").eq(
-                        "scheduled_game_id", game["id"]
-                    ).execute()
-                    
-                    game_data["participants"] = [
-                        {"name": team["team_name"], "score": 0}
-                        for team in teams_response.data
-                    ]
-                else:
-                    players_response = supabase.table("individual_registrations").select("*").eq(
-                        "scheduled_game_id", game["id"]
-                    ).execute()
-                    
-                    game_data["participants"] = [
-                        {"name": player["player_name"], "time": None}
-                        for player in players_response.data
-                    ]
-            
-            result.append(game_data)
+        result.append(game_data)
+    
+    return result
+
+@app.get("/live-games")
+async def get_live_games(request: Request, since: Optional[int] = None):
+    """Get all active games with live scores for public display
+    
+    With ?since=<version> only games changed after that version are sent,
+    along with the ids of every live game so clients can drop finished ones.
+    """
+    try:
+        scoreboard = await get_scoreboard()
+        
+        if since is not None:
+            games = build_live_games(scoreboard)
+            return json_response("live-games", {
+                "version": max([since] + [game["version"] for game in games]),
+                "ids": [game["id"] for game in games],
+                # Games without a state are always sent; their participants come from registrations
+                "games": [
+                    game for game in games
+                    if game["version"] > since or game["id"] not in scoreboard["states"]
+                ]
+            })
         
-        return result
+        # The serialized list is kept with the scoreboard it was built from
+        if "live_response" not in scoreboard:
+            scoreboard["live_response"] = cached_payload(build_live_games(scoreboard))
+        return cached_payload_response(request, scoreboard["live_response"])
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/live-games/stream")
+async def stream_live_games(request: Request):
+    """Push live scores to spectators as Server-Sent Events"""
+    return StreamingResponse(
+        live_event_stream(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/live-games/{scheduled_game_id}")
 async def get_live_game_details(scheduled_game_id: int):
     """Get detailed information for a specific live game"""
     try:
-        # Get scheduled game with game info
-        game_response = supabase.table("scheduled_games").select(
-            "*, games(*)"
-        ).eq("id", scheduled_game_id).eq("is_active", True).execute()
+        scoreboard = await get_scoreboard()
         
-        if not game_response.data:
+        game = next((g for g in scoreboard["games"] if g["id"] == scheduled_game_id), None)
+        if not game:
             raise HTTPException(status_code=404, detail="Active game not found")
         
-        game = game_response.data[0]
-        
-        # Get current game state
-        state_response = supabase.table("active_game_states").select("*").eq(
-            "scheduled_game_id", game["id"]
-        ).execute()
-        
         game_data = {
             "id": game["id"],
             "game": game["games"],
@@ -1314,16 +2465,12 @@ async def get_live_game_details(scheduled_game_id: int):
         }
         
         # Get participants with current scores/times
-        if state_response.data and len(state_response.data) > 0:
-            current_scores = state_response.data[0]["current_scores"]
-            game_data["participants"] = current_scores.get("participants", [])
+        state = scoreboard["states"].get(game["id"])
+        if state:
+            game_data["participants"] = state["current_scores"].get("participants", [])
         
         # Get detailed registration info
         if game["game_type"] == "team":
-            teams_response = supabase.table("team_registrations").select("*").eq(
-                "scheduled_game_id", game["id"]
-            ).execute()
-            
             game_data["registrations"] = [
                 {
                     "teamName": team["team_name"],
@@ -1333,20 +2480,9 @@ async def get_live_game_details(scheduled_game_id: int):
                     "players": team["players"],
                     "registeredAt": team["registered_at"]
                 }
-                for team in teams_response.data
+                for team in scoreboard["teams"].get(game["id"], [])
             ]
-            
-            # If no state exists, initialize from registrations
-            if not game_data["participants"]:
-                game_data["participants"] = [
-                    {"name": team["team_name"], "score": 0}
-                    for team in teams_response.data
-                ]
         else:
-            players_response = supabase.table("individual_registrations").select("*").eq(
-                "scheduled_game_id", game["id"]
-            ).execute()
-            
             game_data["registrations"] = [
                 {
                     "playerName": player["player_name"],
@@ -1355,79 +2491,48 @@ async def get_live_game_details(scheduled_game_id: int):
                     "age": player["age"],
                     "registeredAt": player["registered_at"]
                 }
-                for player in players_response.data
+                for player in scoreboard["players"].get(game["id"], [])
             ]
-            
-            # If no state exists, initialize from registrations
-            if not game_data["participants"]:
-                game_data["participants"] = [
-                    {"name": player["player_name"], "time": None}
-                    for player in players_response.data
-                ]
         
-        return game_data
+        # If no state exists, initialize from registrations
+        if not game_data["participants"]:
+            game_data["participants"] = initial_participants(game, scoreboard)
+        
+        return json_response("live-games", game_data)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
+async def fetch_dashboard_stats():
+    """Fetch every dashboard counter in one round trip, aggregated by the database"""
+    response = await run_query(supabase.rpc("get_dashboard_stats"))
+    return response.data
+
 @app.get("/dashboard/overview")
 async def get_dashboard_overview():
     """Get complete dashboard overview statistics"""
     try:
-        # Get all games
-        games_response = supabase.table("games").select("*").execute()
-        total_games = len(games_response.data)
-        
-        # Get active games
-        active_games_response = supabase.table("scheduled_games").select(
-            "*, games(*)"
-        ).eq("is_active", True).execute()
-        active_games_count = len(active_games_response.data)
-        
-        # Get pending games (scheduled but not active)
-        pending_games_response = supabase.table("scheduled_games").select(
-            "*, games(*)"
-        ).eq("is_active", False).execute()
-        pending_games_count = len(pending_games_response.data)
-        
-        # Get total participants (both team and individual)
-        team_registrations = supabase.table("team_registrations").select("players").execute()
-        total_team_players = sum(len(reg.get("players", [])) for reg in team_registrations.data)
-        
-        individual_registrations = supabase.table("individual_registrations").select("id").execute()
-        total_individual_players = len(individual_registrations.data)
-        
-        total_participants = total_team_players + total_individual_players
+        stats = await fetch_dashboard_stats()
         
         return {
-            "total_games": total_games,
-            "active_games_count": active_games_count,
-            "pending_games_count": pending_games_count,
-            "total_participants": total_participants
+            "total_games": stats["total_games"],
+            "active_games_count": stats["active_games"],
+            "pending_games_count": stats["pending_games"],
+            "total_participants": stats["total_team_players"] + stats["total_individual_players"]
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/dashboard/active-games")
-async def get_dashboard_active_games():
+async def get_dashboard_active_games(top: int = Query(len(MEDALS), ge=1, le=MAX_PAGE_SIZE)):
     """Get active games for dashboard display"""
     try:
-        # Get active scheduled games
-        games_response = supabase.table("scheduled_games").select(
-            "*, games(*)"
-        ).eq("is_active", True).execute()
-        
-        if not games_response.data:
-            return []
+        scoreboard = await get_scoreboard()
+        states = scoreboard["states"]
         
         result = []
-        for game in games_response.data:
-            # Get current game state
-            state_response = supabase.table("active_game_states").select("*").eq(
-                "scheduled_game_id", game["id"]
-            ).execute()
-            
+        for game in scoreboard["games"]:
             game_data = {
                 "id": game["id"],
                 "game": game["games"],
@@ -1440,8 +2545,9 @@ async def get_dashboard_active_games():
             }
             
             # Get participants and scores
-            if state_response.data and len(state_response.data) > 0:
-                current_scores = state_response.data[0]["current_scores"]
+            state = states.get(game["id"])
+            if state:
+                current_scores = state["current_scores"]
                 participants = current_scores.get("participants", [])
                 game_data["participants"] = [p["name"] for p in participants]
                 
@@ -1450,44 +2556,45 @@ async def get_dashboard_active_games():
                     score_parts = [f"{p['name']}: {p.get('score', 0)}" for p in participants]
                     game_data["currentScore"] = " - ".join(score_parts)
                 else:
-                    # For individual, show top 3 times
-                    timed = [p for p in participants if p.get("time")]
-                    sorted_timed = sorted(timed, key=lambda x: float(str(x.get("time", "999")).replace("s", "")))[:3]
-                    score_parts = [f"{p['name']}: {p.get('time')}" for p in sorted_timed]
+                    # For individual, show the top times
+                    timed = [p for p in participants if time_ms(p) is not None]
+                    score_parts = [f"{p['name']}: {p.get('time')}" for _, p in ranked(timed, key=time_ms, limit=top)]
                     game_data["currentScore"] = ", ".join(score_parts) if score_parts else "In Progress"
             else:
                 # If no state, get from registrations
-                if game["game_type"] == "team":
-                    teams_response = supabase.table("team_registrations").select("team_name").eq(
-                        "scheduled_game_id", game["id"]
-                    ).execute()
-                    game_data["participants"] = [team["team_name"] for team in teams_response.data]
-                    game_data["currentScore"] = "0 - 0"
-                else:
-                    players_response = supabase.table("individual_registrations").select("player_name").eq(
-                        "scheduled_game_id", game["id"]
-                    ).execute()
-                    game_data["participants"] = [player["player_name"] for player in players_response.data]
-                    game_data["currentScore"] = "In Progress"
+                game_data["participants"] = [p["name"] for p in initial_participants(game, scoreboard)]
+                game_data["currentScore"] = "0 - 0" if game["game_type"] == "team" else "In Progress"
             
             result.append(game_data)
         
-        return result
+        return json_response("dashboard", result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/dashboard/pending-games")
-async def get_dashboard_pending_games():
+async def get_dashboard_pending_games(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
     """Get pending (scheduled but not activated) games for dashboard"""
     try:
         # Get scheduled games that are not yet active
-        games_response = supabase.table("scheduled_games").select(
-            "*, games(*)"
-        ).eq("is_active", False).order("date", desc=False).order("scheduled_time", desc=False).execute()
+        query = supabase.table("scheduled_games").select("*, games(*)").eq("is_active", False)
+        if limit:
+            query = paginate(query, ["date", "scheduled_time", "id"], limit, cursor)
+        else:
+            query = query.order("date", desc=False).order("scheduled_time", desc=False)
+        
+        games_response = await run_query(query)
         
         if not games_response.data:
             return []
         
+        page_cursor = next_cursor(games_response.data, ["date", "scheduled_time", "id"], limit)
+        if page_cursor:
+            response.headers["X-Next-Cursor"] = page_cursor
+        
         result = []
         for game in games_response.data:
             game_data = {
@@ -1505,34 +2612,39 @@ async def get_dashboard_pending_games():
             
             # Get registered participants
             if game["game_type"] == "team":
-                teams_response = supabase.table("team_registrations").select("team_name").eq(
+                teams_response = await run_query(supabase.table("team_registrations").select("team_name").eq(
                     "scheduled_game_id", game["id"]
-                ).execute()
+                ))
                 game_data["participants"] = [team["team_name"] for team in teams_response.data]
                 game_data["registeredCount"] = len(teams_response.data)
             else:
-                players_response = supabase.table("individual_registrations").select("player_name").eq(
+                players_response = await run_query(supabase.table("individual_registrations").select("player_name").eq(
                     "scheduled_game_id", game["id"]
-                ).execute()
+                ))
                 game_data["participants"] = [player["player_name"] for player in players_response.data]
                 game_data["registeredCount"] = len(players_response.data)
             
             result.append(game_data)
         
-        return result
+        return json_response("dashboard", result, response)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/dashboard/games-by-category/{category}")
-async def get_games_by_category(category: str):
+async def get_games_by_category(category: str, request: Request):
     """Get games filtered by category"""
     try:
-        if category == "all":
-            response = supabase.table("games").select("*").execute()
-        else:
-            response = supabase.table("games").select("*").eq("category", category).execute()
+        # Only real categories get a cached response, so arbitrary paths can't grow the cache
+        if category != "all" and category not in GAME_CATEGORIES:
+            return []
         
-        return response.data
+        games = await get_catalogue()
+        if category != "all":
+            games = [game for game in games if game["category"] == category]
+        
+        return catalogue_response(request, f"category:{category}", games)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1540,45 +2652,21 @@ async def get_games_by_category(category: str):
 async def get_game_statistics():
     """Get detailed game statistics for dashboard"""
     try:
-        # Total games by category
-        games_response = supabase.table("games").select("category").execute()
-        category_counts = {}
-        for game in games_response.data:
-            cat = game.get("category", "other")
-            category_counts[cat] = category_counts.get(cat, 0) + 1
-        
-        # Scheduled games status
-        scheduled_response = supabase.table("scheduled_games").select("is_active").execute()
-        active_count = sum(1 for g in scheduled_response.data if g.get("is_active"))
-        pending_count = len(scheduled_response.data) - active_count
-        
-        # Completed games
-        completed_response = supabase.table("active_game_states").select("id").eq(
-            "status", "completed"
-        ).execute()
-        completed_count = len(completed_response.data)
-        
-        # Registration statistics
-        team_reg_response = supabase.table("team_registrations").select("id, players").execute()
-        individual_reg_response = supabase.table("individual_registrations").select("id").execute()
-        
-        total_teams = len(team_reg_response.data)
-        total_team_players = sum(len(reg.get("players", [])) for reg in team_reg_response.data)
-        total_individual_players = len(individual_reg_response.data)
+        stats = await fetch_dashboard_stats()
         
         return {
-            "games_by_category": category_counts,
+            "games_by_category": stats["games_by_category"],
             "scheduled_games": {
-                "active": active_count,
-                "pending": pending_count,
-                "completed": completed_count,
-                "total": len(scheduled_response.data)
+                "active": stats["active_games"],
+                "pending": stats["total_scheduled_games"] - stats["active_games"],
+                "completed": stats["completed_games"],
+                "total": stats["total_scheduled_games"]
             },
             "registrations": {
-                "total_teams": total_teams,
-                "total_team_players": total_team_players,
-                "total_individual_players": total_individual_players,
-                "total_participants": total_team_players + total_individual_players
+                "total_teams": stats["total_teams"],
+                "total_team_players": stats["total_team_players"],
+                "total_individual_players": stats["total_individual_players"],
+                "total_participants": stats["total_team_players"] + stats["total_individual_players"]
             }
         }
     except Exception as e:
@@ -1588,25 +2676,9 @@ async def get_game_statistics():
 async def get_all_teams_for_game(game_id: int):
     """Get all registered teams for a base game (for league scheduling)"""
     try:
-        # Get the base game (non-league game)
-        base_game = supabase.table("scheduled_games").select("*").eq(
-            "game_id", game_id
-        ).eq("is_league", False).execute()
-        
-        if not base_game.data:
-            return []
-        
-        # Get all teams from all instances of this game
-        all_teams = []
-        for game_instance in base_game.data:
-            teams_response = supabase.table("team_registrations").select("*").eq(
-                "scheduled_game_id", game_instance["id"]
-            ).execute()
-            all_teams.extend(teams_response.data)
-        
-        # Remove duplicates based on team name
-        unique_teams = {team["team_name"]: team for team in all_teams}.values()
-        return list(unique_teams)
+        # Join, filtering and de-duplication by team name happen in the database
+        response = await run_query(supabase.rpc("get_teams_for_game", {"p_game_id": game_id}))
+        return response.data
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1615,22 +2687,22 @@ async def create_league_game(scheduled_game: ScheduledGameCreate, session = Depe
     """Create a league/tournament match between two specific teams"""
     try:
         # Validate that it's a team game
-        game_response = supabase.table("games").select("*").eq("id", scheduled_game.game_id).execute()
+        game_response = await run_query(supabase.table("games").select("*").eq("id", scheduled_game.game_id))
         if not game_response.data:
             raise HTTPException(status_code=404, detail="Game not found")
         
         # Validate teams exist if specified
         if scheduled_game.team1_id:
-            team1 = supabase.table("team_registrations").select("*").eq("id", scheduled_game.team1_id).execute()
+            team1 = await run_query(supabase.table("team_registrations").select("*").eq("id", scheduled_game.team1_id))
             if not team1.data:
                 raise HTTPException(status_code=404, detail="Team 1 not found")
         
         if scheduled_game.team2_id:
-            team2 = supabase.table("team_registrations").select("*").eq("id", scheduled_game.team2_id).execute()
+            team2 = await run_query(supabase.table("team_registrations").select("*").eq("id", scheduled_game.team2_id))
             if not team2.data:
                 raise HTTPException(status_code=404, detail="Team 2 not found")
         
-        response = supabase.table("scheduled_games").insert({
+        response = await run_query(supabase.table("scheduled_games").insert({
             "game_id": scheduled_game.game_id,
             "scheduled_time": scheduled_game.scheduled_time,
             "date": scheduled_game.date,
@@ -1646,11 +2718,11 @@ async def create_league_game(scheduled_game: ScheduledGameCreate, session = Depe
             "team1_id": scheduled_game.team1_id,
             "team2_id": scheduled_game.team2_id,
             "parent_game_id": scheduled_game.parent_game_id
-        }).execute()
+        }))
         
-        result = supabase.table("scheduled_games").select(
+        result = await run_query(supabase.table("scheduled_games").select(
             "*, games(*)"
-        ).eq("id", response.data[0]["id"]).execute()
+        ).eq("id", response.data[0]["id"]))
         
         return result.data[0]
     except HTTPException:
@@ -1658,24 +2730,32 @@ async def create_league_game(scheduled_game: ScheduledGameCreate, session = Depe
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+async def attach_match_teams(matches):
+    """Set team1/team2 on each match from one lookup over all their team ids"""
+    team_ids = list({
+        match[key] for match in matches for key in ("team1_id", "team2_id") if match.get(key)
+    })
+    teams = {}
+    if team_ids:
+        teams_response = await run_query(supabase.table("team_registrations").select("*").in_("id", team_ids))
+        teams = {team["id"]: team for team in teams_response.data}
+    
+    for match in matches:
+        if match.get("team1_id"):
+            match["team1"] = teams.get(match["team1_id"])
+        if match.get("team2_id"):
+            match["team2"] = teams.get(match["team2_id"])
+
 @app.get("/scheduled-games/league/{game_id}")
 async def get_league_matches(game_id: int):
     """Get all league matches for a specific game"""
     try:
-        response = supabase.table("scheduled_games").select(
+        response = await run_query(supabase.table("scheduled_games").select(
             "*, games(*)"
-        ).eq("game_id", game_id).eq("is_league", True).order("date").order("scheduled_time").execute()
-        
-        # Fetch team details for each match
-        for match in response.data:
-            if match.get("team1_id"):
-                team1 = supabase.table("team_registrations").select("*").eq("id", match["team1_id"]).execute()
-                match["team1"] = team1.data[0] if team1.data else None
-            
-            if match.get("team2_id"):
-                team2 = supabase.table("team_registrations").select("*").eq("id", match["team2_id"]).execute()
-                match["team2"] = team2.data[0] if team2.data else None
+        ).eq("game_id", game_id).eq("is_league", True).order("date").order("scheduled_time"))
         
+        # Fetch team details for every match in one query
+        await attach_match_teams(response.data)
         return response.data
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1684,19 +2764,11 @@ async def get_league_matches(game_id: int):
 async def get_matches_by_stage(league_stage: str):
     """Get all matches for a specific league stage"""
     try:
-        response = supabase.table("scheduled_games").select(
+        response = await run_query(supabase.table("scheduled_games").select(
             "*, games(*)"
-        ).eq("league_stage", league_stage).order("date").order("scheduled_time").execute()
-        
-        for match in response.data:
-            if match.get("team1_id"):
-                team1 = supabase.table("team_registrations").select("*").eq("id", match["team1_id"]).execute()
-                match["team1"] = team1.data[0] if team1.data else None
-            
-            if match.get("team2_id"):
-                team2 = supabase.table("team_registrations").select("*").eq("id", match["team2_id"]).execute()
-                match["team2"] = team2.data[0] if team2.data else None
+        ).eq("league_stage", league_stage).order("date").order("scheduled_time"))
         
+        await attach_match_teams(response.data)
         return response.data
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1715,13 +2787,13 @@ async def create_next_stage_match(
     """Create next stage match based on parent game results"""
     try:
         # Get parent game
-        parent = supabase.table("scheduled_games").select("*").eq("id", parent_game_id).execute()
+        parent = await run_query(supabase.table("scheduled_games").select("*").eq("id", parent_game_id))
         if not parent.data:
             raise HTTPException(status_code=404, detail="Parent game not found")
         
         parent_game = parent.data[0]
         
-        response = supabase.table("scheduled_games").insert({
+        response = await run_query(supabase.table("scheduled_games").insert({
             "game_id": parent_game["game_id"],
             "scheduled_time": scheduled_time,
             "date": date,
@@ -1736,7 +2808,7 @@ async def create_next_stage_match(
             "team1_id": team1_id,
             "team2_id": team2_id,
             "parent_game_id": parent_game_id
-        }).execute()
+        }))
         
         return response.data[0]
     except HTTPException:
@@ -1744,14 +2816,173 @@ async def create_next_stage_match(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
+# ==================== BRACKET GENERATION ====================
+
+def knockout_stage(teams_in_round: int):
+    return {2: "final", 4: "semi_final", 8: "quarter_final"}.get(teams_in_round, f"round_of_{teams_in_round}")
+
+def seed_order(size: int):
+    """Seed numbers in bracket slot order, so the top seeds only meet in late rounds"""
+    order = [1]
+    while len(order) < size:
+        order = [seed for s in order for seed in (s, 2 * len(order) + 1 - s)]
+    return order
+
+def schedule_round(matches, round_index: int, bracket: BracketCreate, start, booked: dict):
+    """Spread a round's matches over the venues, starting every match_minutes"""
+    # Rounds past the last date share it, after the matches already booked there
+    day = bracket.dates[min(round_index, len(bracket.dates) - 1)]
+    first = booked.get(day, 0)
+    booked[day] = first + len(matches)
+    for position, match in enumerate(matches, start=first):
+        match["date"] = day
+        match["venue"] = bracket.venues[position % len(bracket.venues)]
+        kickoff = start + timedelta(minutes=bracket.match_minutes * (position // len(bracket.venues)))
+        match["scheduled_time"] = kickoff.strftime("%H:%M")
+
+def league_match_row(game_id: int, stage: str, team1, team2, bracket: BracketCreate):
+    return {
+        "game_id": game_id,
+        "participants": [team1["team_name"] if team1 else "", team2["team_name"] if team2 else ""],
+        "game_type": "team",
+        "is_active": False,
+        "registration_open": False,
+        "max_teams": 2,
+        "max_players_per_team": bracket.max_players_per_team,
+        "is_league": True,
+        "league_stage": stage,
+        "team1_id": team1["id"] if team1 else None,
+        "team2_id": team2["id"] if team2 else None
+    }
+
+def knockout_rounds(game_id: int, teams, bracket: BracketCreate):
+    """Build every round of a single-elimination bracket, giving byes to the top seeds"""
+    size = 1 << (len(teams) - 1).bit_length()
+    slots = [teams[seed - 1] if seed <= len(teams) else None for seed in seed_order(size)]
+    
+    # rounds[r][k] feeds slot k % 2 + 1 of rounds[r + 1][k // 2]; None means no match
+    rounds = []
+    entrants = slots
+    while len(entrants) > 1:
+        stage = knockout_stage(len(entrants))
+        matches = []
+        for k in range(0, len(entrants), 2):
+            pair = entrants[k:k + 2]
+            if len(rounds) == 0 and None in pair:
+                # A bye: the seeded team goes straight into the next round
+                matches.append(None)
+            else:
+                matches.append(league_match_row(game_id, stage, pair[0], pair[1], bracket))
+        rounds.append(matches)
+        entrants = [
+            pair_team if match is None else None
+            for match, pair_team in zip(matches, [a or b for a, b in zip(entrants[::2], entrants[1::2])])
+        ]
+    return rounds
+
+def round_robin_rounds(game_id: int, teams, bracket: BracketCreate):
+    """Pair every team with every other once, using the circle method"""
+    entrants = list(teams) + ([None] if len(teams) % 2 else [])
+    rounds = []
+    for _ in range(len(entrants) - 1):
+        half = len(entrants) // 2
+        rounds.append([
+            league_match_row(game_id, "group", home, away, bracket)
+            for home, away in zip(entrants[:half], reversed(entrants[half:]))
+            if home and away
+        ])
+        entrants = [entrants[0], entrants[-1]] + entrants[1:-1]
+    return rounds
+
+async def insert_bracket(game_id: int, rows):
+    """Insert every match of a bracket in one transaction, refusing a second bracket for the game"""
+    response = await run_query(supabase.rpc("create_league_bracket", {
+        "p_game_id": game_id,
+        "p_matches": rows
+    }))
+    if response.data.get("error") == "bracket_exists":
+        raise HTTPException(status_code=409, detail="League matches already exist for this game")
+    invalidate_scoreboard()
+    return response.data["matches"]
+
+@app.post("/scheduled-games/league/{game_id}/bracket")
+async def create_bracket(game_id: int, bracket: BracketCreate, session = Depends(verify_admin_token)):
+    """Generate every league match of a single-elimination or round-robin bracket"""
+    try:
+        if bracket.format not in ("single_elimination", "round_robin"):
+            raise HTTPException(status_code=400, detail="Format must be 'single_elimination' or 'round_robin'")
+        if not bracket.dates or not bracket.venues or bracket.match_minutes < 0:
+            raise HTTPException(status_code=400, detail="At least one date and one venue are needed")
+        try:
+            start = datetime.strptime(bracket.start_time, "%H:%M")
+        except ValueError:
+            raise HTTPException(status_code=400, detail="start_time must be HH:MM")
+        
+        teams_response = await run_query(supabase.rpc("get_teams_for_game", {"p_game_id": game_id}))
+        teams = teams_response.data
+        if bracket.team_ids is not None:
+            # team_ids also sets the seeding, best seed first
+            teams_by_id = {team["id"]: team for team in teams}
+            missing = [team_id for team_id in bracket.team_ids if team_id not in teams_by_id]
+            if missing or len(set(bracket.team_ids)) != len(bracket.team_ids):
+                raise HTTPException(status_code=400, detail="team_ids must be distinct teams registered for this game")
+            teams = [teams_by_id[team_id] for team_id in bracket.team_ids]
+        else:
+            teams = sorted(teams, key=lambda team: (team.get("registered_at") or "", team["id"]))
+        if len(teams) < 2:
+            raise HTTPException(status_code=400, detail="At least two teams are needed for a bracket")
+        
+        if bracket.format == "round_robin":
+            rounds = round_robin_rounds(game_id, teams, bracket)
+            booked = {}
+            for index, matches in enumerate(rounds):
+                schedule_round(matches, index, bracket, start, booked)
+            created = await insert_bracket(game_id, [match for matches in rounds for match in matches])
+            return {"format": bracket.format, "rounds": len(rounds), "matches": created}
+        
+        rounds = knockout_rounds(game_id, teams, bracket)
+        booked = {}
+        for index, matches in enumerate(rounds):
+            schedule_round([match for match in matches if match], index, bracket, start, booked)
+        
+        # The database inserts in list order, so the final goes first and every
+        # match can name the one its winner moves to by key
+        rows = []
+        for round_index in reversed(range(len(rounds))):
+            for k, match in enumerate(rounds[round_index]):
+                if not match:
+                    continue
+                match["key"] = f"{round_index}:{k}"
+                if round_index + 1 < len(rounds):
+                    match["next_key"] = f"{round_index + 1}:{k // 2}"
+                    match["bracket_slot"] = k % 2 + 1
+                rows.append(match)
+        created = await insert_bracket(game_id, rows)
+        
+        # Hand the matches back first round first, as they are played
+        sizes = [len([match for match in matches if match]) for matches in reversed(rounds)]
+        chunks = []
+        for size in sizes:
+            chunks.append(created[:size])
+            created = created[size:]
+        return {
+            "format": bracket.format,
+            "rounds": len(rounds),
+            "matches": [match for chunk in reversed(chunks) for match in chunk]
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/team-registrations/{registration_id}/add-player")
 async def add_player_to_team(registration_id: int, player: PlayerUpdate):
     """Add a player to an existing team"""
     try:
         # Get current team registration
-        team_response = supabase.table("team_registrations").select("*").eq(
+        team_response = await run_query(supabase.table("team_registrations").select("*").eq(
             "id", registration_id
-        ).execute()
+        ))
         
         if not team_response.data:
             raise HTTPException(status_code=404, detail="Team not found")
@@ -1763,9 +2994,9 @@ async def add_player_to_team(registration_id: int, player: PlayerUpdate):
             raise HTTPException(status_code=400, detail="Player already exists in this team")
         
         # Get the scheduled game to check max players limit
-        game_response = supabase.table("scheduled_games").select("*").eq(
+        game_response = await run_query(supabase.table("scheduled_games").select("*").eq(
             "id", team["scheduled_game_id"]
-        ).execute()
+        ))
         
         if game_response.data:
             max_players = game_response.data[0].get("max_players_per_team")
@@ -1779,10 +3010,11 @@ async def add_player_to_team(registration_id: int, player: PlayerUpdate):
         updated_players = team["players"] + [player.player_name]
         
         # Update team registration
-        response = supabase.table("team_registrations").update({
+        response = await run_query(supabase.table("team_registrations").update({
             "players": updated_players
-        }).eq("id", registration_id).execute()
+        }).eq("id", registration_id))
         
+        invalidate_scoreboard()
         return response.data[0]
     except HTTPException:
         raise
@@ -1794,9 +3026,9 @@ async def edit_player_in_team(registration_id: int, player_index: int, player: P
     """Edit a player's name in a team"""
     try:
         # Get current team registration
-        team_response = supabase.table("team_registrations").select("*").eq(
+        team_response = await run_query(supabase.table("team_registrations").select("*").eq(
             "id", registration_id
-        ).execute()
+        ))
         
         if not team_response.data:
             raise HTTPException(status_code=404, detail="Team not found")
@@ -1818,10 +3050,11 @@ async def edit_player_in_team(registration_id: int, player_index: int, player: P
         updated_players[player_index] = player.player_name
         
         # Update team registration
-        response = supabase.table("team_registrations").update({
+        response = await run_query(supabase.table("team_registrations").update({
             "players": updated_players
-        }).eq("id", registration_id).execute()
+        }).eq("id", registration_id))
         
+        invalidate_scoreboard()
         return response.data[0]
     except HTTPException:
         raise
@@ -1833,9 +3066,9 @@ async def delete_player_from_team(registration_id: int, player_index: int):
     """Delete a player from a team"""
     try:
         # Get current team registration
-        team_response = supabase.table("team_registrations").select("*").eq(
+        team_response = await run_query(supabase.table("team_registrations").select("*").eq(
             "id", registration_id
-        ).execute()
+        ))
         
         if not team_response.data:
             raise HTTPException(status_code=404, detail="Team not found")
@@ -1855,10 +3088,11 @@ async def delete_player_from_team(registration_id: int, player_index: int):
         updated_players.pop(player_index)
         
         # Update team registration
-        response = supabase.table("team_registrations").update({
+        response = await run_query(supabase.table("team_registrations").update({
             "players": updated_players
-        }).eq("id", registration_id).execute()
+        }).eq("id", registration_id))
         
+        invalidate_scoreboard()
         return {"message": "Player deleted successfully", "team": response.data[0]}
     except HTTPException:
         raise
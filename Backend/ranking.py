@@ -0,0 +1,37 @@
+"""Tie-aware ranking for results and live standings.
+
+Only the top of a large field is usually shown, so ranked() finds the cut-off
+with a heap selection instead of sorting every participant.
+"""
+import heapq
+
+MEDALS = ["gold", "silver", "bronze"]
+
+
+def ranked(items, key, limit=None):
+    """Rank items best (smallest key) first as (position, item) pairs.
+
+    Equal keys share a position and the next position is skipped, so two
+    runners tied for silver are both 2nd and the next one is 4th. With a
+    limit, everyone tied with the last place inside it is kept as well.
+    """
+    keys = list(map(key, items))
+    if limit is not None and limit < len(keys):
+        if limit <= 0:
+            return []
+        cutoff = heapq.nsmallest(limit, keys)[-1]
+        keyed = [entry for entry in zip(keys, items) if entry[0] <= cutoff]
+    else:
+        keyed = list(zip(keys, items))
+    keyed.sort(key=lambda entry: entry[0])
+
+    result = []
+    for index, (value, item) in enumerate(keyed):
+        if index == 0 or value != keyed[index - 1][0]:
+            position = index + 1
+        result.append((position, item))
+    return result
+
+
+def medal(position):
+    return MEDALS[position - 1] if position <= len(MEDALS) else None
@@ -0,0 +1,73 @@
+"""Winners of league matches move on to the right match and slot."""
+import json
+
+import pytest
+
+psycopg = pytest.importorskip("psycopg")
+
+
+def register_teams(conn, scheduled_game, names):
+    return [
+        conn.execute(
+            "INSERT INTO team_registrations (scheduled_game_id, team_name, captain_name, players) "
+            "VALUES (%s, %s, 'Captain', '{}') RETURNING id",
+            (scheduled_game, name),
+        ).fetchone()[0]
+        for name in names
+    ]
+
+
+def match_row(stage, key, next_key=None, slot=None, teams=(None, None), names=("", "")):
+    row = {
+        "scheduled_time": "10:00", "date": "2026-01-15", "venue": "Ground",
+        "participants": list(names), "league_stage": stage, "key": key,
+        "team1_id": teams[0], "team2_id": teams[1]
+    }
+    if next_key:
+        row.update(next_key=next_key, bracket_slot=slot)
+    return row
+
+
+def match(conn, match_id):
+    return conn.execute(
+        "SELECT team1_id, team2_id, participants, parent_game_id, next_match_id FROM scheduled_games WHERE id = %s",
+        (match_id,),
+    ).fetchone()
+
+
+def test_generated_bracket_and_next_stage_links(database_url, scheduled_game):
+    with psycopg.connect(database_url, autocommit=True) as conn:
+        game_id = conn.execute("SELECT game_id FROM scheduled_games WHERE id = %s", (scheduled_game,)).fetchone()[0]
+        a, b, c, d = register_teams(conn, scheduled_game, ["A", "B", "C", "D"])
+
+        rows = [
+            match_row("final", "1:0"),
+            match_row("semi", "0:0", "1:0", 1, (a, b), ("A", "B")),
+            match_row("semi", "0:1", "1:0", 2, (c, d), ("C", "D")),
+        ]
+        created = conn.execute(
+            "SELECT create_league_bracket(%s, %s)", (game_id, json.dumps(rows))
+        ).fetchone()[0]["matches"]
+        final, semi1, semi2 = (row["id"] for row in created)
+        assert match(conn, semi1)[3:] == (None, final)
+
+        again = conn.execute("SELECT create_league_bracket(%s, %s)", (game_id, json.dumps(rows))).fetchone()[0]
+        assert again == {"error": "bracket_exists"}
+
+        # A /next-stage match made from a generated semi-final points back at it
+        playoff = conn.execute(
+            "INSERT INTO scheduled_games (game_id, scheduled_time, date, venue, participants, is_league, "
+            "league_stage, parent_game_id) VALUES (%s, '12:00', '2026-01-15', 'Ground', '{}', TRUE, 'playoff', %s) "
+            "RETURNING id",
+            (game_id, semi2),
+        ).fetchone()[0]
+
+        conn.execute("SELECT complete_scheduled_game(%s, 'D')", (semi2,))
+        conn.execute("SELECT complete_scheduled_game(%s, 'A')", (semi1,))
+        assert match(conn, final)[:3] == (a, d, ["A", "D"])
+        assert match(conn, playoff)[:2] == (None, None)
+
+        # A /next-stage match takes the winner of the match it follows
+        conn.execute("UPDATE scheduled_games SET parent_game_id = %s WHERE id = %s", (final, playoff))
+        conn.execute("SELECT complete_scheduled_game(%s, 'D')", (final,))
+        assert match(conn, playoff)[:3] == (d, None, ["D", ""])
@@ -0,0 +1,51 @@
+"""increment_participant_score must not lose updates under concurrency."""
+import json
+
+import pytest
+
+psycopg = pytest.importorskip("psycopg")
+
+INCREMENTS = 1000
+
+
+def test_parallel_increments_reach_exact_total(database_url, scheduled_game, run_concurrently):
+    participants = [{"name": "Red", "score": 0}, {"name": "Blue", "score": 5}]
+    with psycopg.connect(database_url, autocommit=True) as conn:
+        conn.execute(
+            "INSERT INTO active_game_states (scheduled_game_id, current_scores) VALUES (%s, %s)",
+            (scheduled_game, json.dumps({"participants": participants})),
+        )
+
+    def increment(conn):
+        return conn.execute(
+            "SELECT 1 FROM increment_participant_score(%s, %s, %s)",
+            (scheduled_game, 0, 1),
+        ).fetchone()
+
+    results = run_concurrently(INCREMENTS, increment)
+    assert all(row is not None for row in results)
+
+    with psycopg.connect(database_url) as conn:
+        scores = conn.execute(
+            "SELECT current_scores FROM active_game_states WHERE scheduled_game_id = %s",
+            (scheduled_game,),
+        ).fetchone()[0]
+    assert scores["participants"][0]["score"] == INCREMENTS
+    assert scores["participants"][1]["score"] == 5
+
+
+def test_out_of_range_index_returns_the_state_unchanged(database_url, scheduled_game):
+    with psycopg.connect(database_url, autocommit=True) as conn:
+        missing = conn.execute(
+            "SELECT * FROM increment_participant_score(%s, 0, 1)", (scheduled_game,)
+        ).fetchall()
+        conn.execute(
+            "INSERT INTO active_game_states (scheduled_game_id, current_scores) VALUES (%s, %s)",
+            (scheduled_game, json.dumps({"participants": [{"name": "Red", "score": 3}]})),
+        )
+        unchanged = conn.execute(
+            "SELECT current_scores FROM increment_participant_score(%s, 1, 1)", (scheduled_game,)
+        ).fetchall()
+
+    assert missing == []
+    assert unchanged == [({"participants": [{"name": "Red", "score": 3}]},)]
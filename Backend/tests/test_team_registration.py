@@ -0,0 +1,82 @@
+"""register_team must never admit more teams than max_teams."""
+import pytest
+
+psycopg = pytest.importorskip("psycopg")
+
+CAPTAINS = 500
+MAX_TEAMS = 16
+
+
+def test_concurrent_registrations_stop_at_the_cap(database_url, scheduled_game, run_concurrently):
+    with psycopg.connect(database_url, autocommit=True) as conn:
+        conn.execute("UPDATE scheduled_games SET max_teams = %s WHERE id = %s", (MAX_TEAMS, scheduled_game))
+
+    numbers = iter(range(CAPTAINS))
+
+    def register(conn):
+        number = next(numbers)
+        return conn.execute(
+            "SELECT register_team(%s, %s, %s, NULL, NULL, %s)",
+            (scheduled_game, f"Team {number}", f"Captain {number}", [f"Player {number}"]),
+        ).fetchone()[0]
+
+    results = run_concurrently(CAPTAINS, register)
+
+    admitted = [result for result in results if "registration" in result]
+    assert len(admitted) == MAX_TEAMS
+    assert all(result == {"error": "full"} for result in results if "registration" not in result)
+
+    with psycopg.connect(database_url) as conn:
+        count = conn.execute(
+            "SELECT COUNT(*) FROM team_registrations WHERE scheduled_game_id = %s", (scheduled_game,)
+        ).fetchone()[0]
+    assert count == MAX_TEAMS
+
+
+def test_concurrent_duplicate_names_admit_one_team(database_url, scheduled_game, run_concurrently):
+    def register(conn):
+        return conn.execute(
+            "SELECT register_team(%s, 'Same Name', 'Captain', NULL, NULL, %s)",
+            (scheduled_game, ["Player"]),
+        ).fetchone()[0]
+
+    results = run_concurrently(100, register)
+
+    assert sum("registration" in result for result in results) == 1
+    assert all(result == {"error": "duplicate"} for result in results if "registration" not in result)
+
+
+def test_bulk_import_racing_sign_ups_stops_at_the_cap(database_url, scheduled_game, run_concurrently):
+    from psycopg.types.json import Jsonb
+
+    with psycopg.connect(database_url, autocommit=True) as conn:
+        conn.execute("UPDATE scheduled_games SET max_teams = %s WHERE id = %s", (MAX_TEAMS, scheduled_game))
+
+    imported = [
+        {"scheduled_game_id": scheduled_game, "team_name": f"Imported {number}",
+         "captain_name": f"Captain {number}", "players": [f"Player {number}"]}
+        for number in range(MAX_TEAMS)
+    ]
+    # The last row repeats a name; it must come back as a row result, not abort the batch
+    imported.append(dict(imported[0]))
+    numbers = iter(range(CAPTAINS))
+
+    def register(conn):
+        number = next(numbers)
+        if number == CAPTAINS // 2:
+            return conn.execute("SELECT register_teams(%s)", (Jsonb(imported),)).fetchone()[0]
+        return [conn.execute(
+            "SELECT register_team(%s, %s, %s, NULL, NULL, %s)",
+            (scheduled_game, f"Team {number}", f"Captain {number}", [f"Player {number}"]),
+        ).fetchone()[0]]
+
+    results = [result for batch in run_concurrently(CAPTAINS, register) for result in batch]
+
+    assert sum("registration" in result for result in results) == MAX_TEAMS
+    assert all(result["error"] in ("full", "duplicate") for result in results if "registration" not in result)
+
+    with psycopg.connect(database_url) as conn:
+        count = conn.execute(
+            "SELECT COUNT(*) FROM team_registrations WHERE scheduled_game_id = %s", (scheduled_game,)
+        ).fetchone()[0]
+    assert count == MAX_TEAMS
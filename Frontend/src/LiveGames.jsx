@@ -1,8 +1,18 @@
- import React, { useState, useEffect } from 'react';
+ import React, { useState, useEffect, useRef } from 'react';
 import { ArrowLeft, Trophy, Clock, MapPin, Users, User, RefreshCw, X } from 'lucide-react';
 import axios from 'axios';
 
 const API_BASE_URL = 'http://localhost:8000';
+const RESYNC_INTERVAL_MS = 30000;
+
+// Apply a /live-games?since= response: keep the games still live, swap in changed ones
+const applyLiveDelta = (games, delta) => {
+  const changed = new Map(delta.games.map((game) => [game.id, game]));
+  const current = new Map(games.map((game) => [game.id, game]));
+  return delta.ids.map((id) => changed.get(id) || current.get(id)).filter(Boolean);
+};
+
+const latestVersion = (games) => Math.max(0, ...games.map((game) => game.version || 0));
 
 export default function LiveGames() {
   const [liveGames, setLiveGames] = useState([]);
@@ -11,25 +21,60 @@ export default function LiveGames() {
   const [gameDetails, setGameDetails] = useState(null);
   const [loadingDetails, setLoadingDetails] = useState(false);
   const [autoRefresh, setAutoRefresh] = useState(true);
+  const versionRef = useRef(0);
+  const selectedGameRef = useRef(null);
+
+  useEffect(() => {
+    versionRef.current = latestVersion(liveGames);
+  }, [liveGames]);
+
+  useEffect(() => {
+    selectedGameRef.current = selectedGame;
+  }, [selectedGame]);
 
   useEffect(() => {
     fetchLiveGames();
     
-    // Auto-refresh every 10 seconds if enabled
+    // Live updates are pushed by the server while auto-refresh is enabled.
+    // A slow poll picks up anything the stream missed, such as writes
+    // handled by another server process.
+    let source;
     let interval;
     if (autoRefresh) {
+      source = new EventSource(`${API_BASE_URL}/live-games/stream`);
+      
+      source.addEventListener('snapshot', (event) => {
+        setLiveGames(JSON.parse(event.data));
+        setLoading(false);
+        refreshSelectedGame();
+      });
+      
+      source.addEventListener('scores', (event) => {
+        const update = JSON.parse(event.data);
+        setLiveGames((games) => games.map((game) =>
+          game.id === update.id ? { ...game, participants: update.participants } : game
+        ));
+        setGameDetails((details) =>
+          details && details.id === update.id ? { ...details, participants: update.participants } : details
+        );
+      });
+      
+      source.addEventListener('winner', (event) => {
+        const update = JSON.parse(event.data);
+        setLiveGames((games) => games.filter((game) => game.id !== update.id));
+      });
+      
       interval = setInterval(() => {
-        fetchLiveGames();
-        if (selectedGame) {
-          fetchGameDetails(selectedGame.id);
-        }
-      }, 10000);
+        resyncLiveGames();
+        refreshSelectedGame();
+      }, RESYNC_INTERVAL_MS);
     }
     
     return () => {
+      if (source) source.close();
       if (interval) clearInterval(interval);
     };
-  }, [autoRefresh, selectedGame]);
+  }, [autoRefresh]);
 
   const fetchLiveGames = async () => {
     try {
@@ -42,6 +87,29 @@ export default function LiveGames() {
     }
   };
 
+  const resyncLiveGames = async () => {
+    try {
+      const response = await axios.get(`${API_BASE_URL}/live-games`, {
+        params: { since: versionRef.current }
+      });
+      setLiveGames((games) => applyLiveDelta(games, response.data));
+    } catch (error) {
+      console.error('Error refreshing live games:', error);
+    }
+  };
+
+  // Reload the open game's details, including its registrations, in the background
+  const refreshSelectedGame = async () => {
+    const game = selectedGameRef.current;
+    if (!game) return;
+    try {
+      const response = await axios.get(`${API_BASE_URL}/live-games/${game.id}`);
+      setGameDetails((details) => (details && details.id === game.id ? response.data : details));
+    } catch (error) {
+      console.error('Error refreshing game details:', error);
+    }
+  };
+
   const fetchGameDetails = async (gameId) => {
     setLoadingDetails(true);
     try {
@@ -1,27 +1,75 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { Menu, X, Calendar, Trophy, Users, Sparkles, Clock, MapPin, ChevronRight } from 'lucide-react';
 import { Routes, Route, Link } from 'react-router-dom';
 import axios from 'axios';
 
 const API_BASE_URL = 'http://localhost:8000';
+const RESYNC_INTERVAL_MS = 30000;
+
+// Apply a /live-games?since= response: keep the games still live, swap in changed ones
+const applyLiveDelta = (games, delta) => {
+  const changed = new Map(delta.games.map((game) => [game.id, game]));
+  const current = new Map(games.map((game) => [game.id, game]));
+  return delta.ids.map((id) => changed.get(id) || current.get(id)).filter(Boolean);
+};
+
+const latestVersion = (games) => Math.max(0, ...games.map((game) => game.version || 0));
 
 export default function PongalLanding() {
   const [isMenuOpen, setIsMenuOpen] = useState(false);
   const [selectedLiveGame, setSelectedLiveGame] = useState(null);
   const [liveGames, setLiveGames] = useState([]);
   const [loading, setLoading] = useState(true);
+  const versionRef = useRef(0);
+
+  useEffect(() => {
+    versionRef.current = latestVersion(liveGames);
+  }, [liveGames]);
 
   useEffect(() => {
     fetchLiveGames();
     
-    // Auto-refresh every 15 seconds
-    const interval = setInterval(() => {
-      fetchLiveGames();
-    }, 15000);
+    // Live score updates are pushed by the server. A slow poll picks up
+    // anything the stream missed, such as writes handled by another server
+    // process.
+    const source = new EventSource(`${API_BASE_URL}/live-games/stream`);
+    
+    source.addEventListener('snapshot', (event) => {
+      setLiveGames(JSON.parse(event.data));
+      setLoading(false);
+    });
+    
+    source.addEventListener('scores', (event) => {
+      const update = JSON.parse(event.data);
+      setLiveGames((games) => games.map((game) =>
+        game.id === update.id ? { ...game, participants: update.participants } : game
+      ));
+    });
     
-    return () => clearInterval(interval);
+    source.addEventListener('winner', (event) => {
+      const update = JSON.parse(event.data);
+      setLiveGames((games) => games.filter((game) => game.id !== update.id));
+    });
+    
+    const interval = setInterval(resyncLiveGames, RESYNC_INTERVAL_MS);
+    
+    return () => {
+      source.close();
+      clearInterval(interval);
+    };
   }, []);
 
+  const resyncLiveGames = async () => {
+    try {
+      const response = await axios.get(`${API_BASE_URL}/live-games`, {
+        params: { since: versionRef.current }
+      });
+      setLiveGames((games) => applyLiveDelta(games, response.data));
+    } catch (error) {
+      console.error('Error refreshing live games:', error);
+    }
+  };
+
   const fetchLiveGames = async () => {
     try {
       const response = await axios.get(`${API_BASE_URL}/live-games`);